@@ -49,6 +49,10 @@
 # Arg8 = Your username like "uidv2966"
 # Arg9 = You general ADAS password "..."
 
+# To create several artifacts in one run, provide a CSV file instead of Arg1, Arg2, Arg3 and Arg7:
+# --batch <file.csv> Arg4 Arg5 Arg6 Arg8 Arg9
+# each row of the file is: Type of Artifact,Text of the Artifact,Folder,Module
+
 #Example of an call to create an Requirement
 # -> Requirement "ADAS_Rating_Requirement" "ConsumerRatings artifacts" "LIB_Stakeholder_StandardsRegulations_RM" "LIB_Stakeholder_StandardsRegulations_ConsumerRatings_RM" "holger_30_Arpil_2024" "ConsumerRatings" "<your uid>" "<your password>"
 
@@ -57,14 +61,30 @@
 
 
 
+import concurrent.futures
+import array
+import copy
+import io
 import logging
 import os.path
+import pickle
 import sys
 import time
 import csv
+import json
 
 import lxml.etree as ET
-import tqdm
+
+# orjson parses and serializes the (possibly huge) module structure JSON much faster - use it if it's installed
+# json_dumps returns the UTF-8 bytes to send, so the body is serialized exactly once whatever characters it contains
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+    def json_dumps( obj ):
+        return json.dumps( obj ).encode()
 
 import elmclient.server as elmserver
 import elmclient.utils as utils
@@ -104,120 +124,232 @@ rmcontext  = 'rm4'
 #comp = proj
 #conf =  f"{comp} Initial Stream"
 #mod = "ConsumerRatings"
-format = "JSON"
 
 # caching control
 # 0=fully cached (but code below specifies queries aren't cached) - if you need to clear the cache, delet efolder .web_cache
 # 1=clear cache initially then continue with cache enabled
 # 2=clear cache and disable caching
+# NOTE with 0/1 elmclient caches every cacheable GET for up to a week, including configuration and folder lookups - so a new changeset or folder
+# wouldn't be found. Keep caching disabled; the shape titles are remembered between runs separately (see shapecachefile below)
 caching = 2
+
+# number of connections kept open to the server - these are reused (keep-alive) for all the requests
+poolsize = 32
+
+# set to True to print the module structure after the update - NOTE this costs a query over the module plus a GET for every artifact not returned
+# by it, so with it off (the default) the script stops after the structure has been updated, like it always did
+report = False
     
 	
 
 
+##################################################################################
+# text of the XML with basic content of a new artifact (this is based on example in section 2 of https://jazz.net/library/article/1197
+# it is parsed only once - title, primary text, shape and parent folder are filled in on a copy for every artifact created
+BLANK_ARTIFACT_XML = """<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns:dc="http://purl.org/dc/terms/"
+         xmlns:public_rm_10="http://www.ibm.com/xmlns/rm/public/1.0/"
+         xmlns:jazz_rm="http://jazz.net/ns/rm#"
+         xmlns:calm="http://jazz.net/xmlns/prod/jazz/calm/1.0/"
+         xmlns:rm="http://www.ibm.com/xmlns/rdm/rdf/"
+         xmlns:acp="http://jazz.net/ns/acp#"
+         xmlns:rm_property="https://grarrc.ibm.com:9443/rm/types/"
+         xmlns:oslc="http://open-services.net/ns/core#"
+         xmlns:nav="http://jazz.net/ns/rm/navigation#"
+         xmlns:oslc_rm="http://open-services.net/ns/rm#">
+    <rdf:Description rdf:about="">
+        <rdf:type rdf:resource="http://open-services.net/ns/rm#Requirement"/>
+        <dc:description rdf:parseType="Literal">Holgi was here</dc:description>
+        <jazz_rm:primaryText rdf:parseType="Literal">
+            <div
+                xmlns="http://www.w3.org/1999/xhtml"><p><span></span></p>
+            </div>
+        </jazz_rm:primaryText>
+        <dc:title rdf:parseType="Literal"></dc:title>
+        <oslc:instanceShape rdf:resource=""/>
+        <nav:parent rdf:resource=""/>
+    </rdf:Description>
+</rdf:RDF>
+"""
+_BLANK_ARTIFACT_X = ET.fromstring( BLANK_ARTIFACT_XML )
+
+# the additional types of a Heading - these follow the oslc_rm:Requirement type
+HEADING_TYPES = [ "https://hep.continental.com/ns/automotive/rm/ty/heading", "http://jazz.net/ns/rm#Text" ]
+
+# prefixes used in the template (note dc here is dcterms)
+NSMAP = {
+    'rdf': "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    'dc': "http://purl.org/dc/terms/",
+    'jazz_rm': "http://jazz.net/ns/rm#",
+    'oslc': "http://open-services.net/ns/core#",
+    'nav': "http://jazz.net/ns/rm/navigation#",
+    'xhtml': "http://www.w3.org/1999/xhtml",
+}
+
+##################################################################################
+# XPaths used on the artifacts, shapes, module and trackers retrieved - compiled only once, all sharing one namespace map built at load
+_NSMAP = dict( rdfxml.RDF_DEFAULT_PREFIX )
+_XP_TITLE = ET.XPath( './/dcterms:title', namespaces=_NSMAP )
+_XP_IDENTIFIER = ET.XPath( './/dcterms:identifier', namespaces=_NSMAP )
+_XP_SHAPE_TITLE = ET.XPath( './/oslc:ResourceShape/dcterms:title', namespaces=_NSMAP )
+_XP_STRUCTURE = ET.XPath( './/rm_modules:structure/@rdf:resource', namespaces=_NSMAP )
+_XP_TRACKER_COMPLETE = ET.XPath( ".//oslc_auto:state[@rdf:resource='http://open-services.net/ns/auto#complete']", namespaces=_NSMAP )
+_XP_TRACKER_ERROR = ET.XPath( ".//oslc_auto:verdict[@rdf:resource='http://open-services.net/ns/auto#error']", namespaces=_NSMAP )
+_XP_TRACKER_STATUSCODE = ET.XPath( './/oslc:statusCode', namespaces=_NSMAP )
+_XP_TRACKER_MESSAGE = ET.XPath( './/oslc:message', namespaces=_NSMAP )
+
+# returns the text of the first element found by a compiled XPath, or None if there isn't one (like rdfxml.xmlrdf_get_resource_text)
+def xpath_text( xpath, xml ):
+    found = xpath( xml )
+    return found[0].text if found else None
+
+
+##################################################################################
+# the shape titles found are remembered between runs - a dictionary keyed by (component URL,configuration URL), values are dictionaries of shape title -> shape URL
+# if you need to clear the cache, delete the file
+shapecachefile = os.path.expanduser( "~/.cache/gemini_exchange/shapes.pkl" )
+
+def load_shape_cache():
+    try:
+        with open( shapecachefile, "rb" ) as f:
+            return pickle.load( f )
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return {}
+
+# a cache that can't be written isn't an error - the shapes are just read again next time
+def save_shape_cache( shapecache ):
+    try:
+        os.makedirs( os.path.dirname( shapecachefile ), exist_ok=True )
+        with open( shapecachefile, "wb" ) as f:
+            pickle.dump( shapecache, f )
+    except OSError as e:
+        print( f"Shape cache not saved: {e}" )
+
+
 ##################################################################################
 # converts heading level into a string that looks like "section" when you add that column into a module
 # not exhaustively tested but seems to work :-)
 # NOTE NOTE NOTE the section number calculation has not been fully verified/checked - it seems to work after superficial inspection
-def getsectionnumber( headinglevel):
-    hs = []
-    for hn,tn in headinglevel:
-        if tn:
-            hs.append( f"{hn}-{tn}" )
-        else:
-            hs.append( f"{hn}" )
-    h = ".".join(hs)
-    return h
+# headings and subs are arrays indexed by level (index 0 unused) - headings has the heading number, subs the non-heading number
+def getsectionnumber( headings, subs, level ):
+    return ".".join( f"{headings[i]}-{subs[i]}" if subs[i] else str(headings[i]) for i in range(1,level+1) )
+
+# indentation for each level of the module walk - precomputed rather than multiplying a string for every artifact
+_INDENT = [ '    '*i for i in range(64) ]
+
+
+##################################################################################
+# retrieve title and identifier of all the artifacts in a module using a single (paged) OSLC query
+# returns a dictionary keyed by the artifact URL, values are (title,identifier)
+# this avoids a GET for every artifact when walking the module structure
+def get_module_artifact_details( c, qcbase, module_u ):
+    artifacts = c.execute_oslc_query(
+        qcbase,
+        whereterms=[['rm:module','=',f'<{module_u}>']],
+        select=['dcterms:title','dcterms:identifier'],
+        prefixes={rdfxml.RDF_DEFAULT_PREFIX["dcterms"]:'dcterms'}
+        )
+    details = {}
+    for k,v in artifacts.items():
+        details[k] = ( v.get("dcterms:title",""), v.get("dcterms:identifier","-") )
+    return details
+
+
+##################################################################################
+# returns (title,identifier) for an artifact by retrieving the artifact
+def get_artifact_title_and_id( c, ba_u ):
+    req_x = c.execute_get_rdf_xml( ba_u, cacheable=False, intent="Retrieve artifact detail to get title and identifier"  )
+    return ( xpath_text( _XP_TITLE, req_x ), xpath_text( _XP_IDENTIFIER, req_x ) )
 
 
 ##################################################################################
-# iterator to walk the XML hierarchy in a way that lets us track entry/exit from a nesting
-def iterwalk(root, events=None, tags=None):
-    """Incrementally walks XML structure (like iterparse but for an existing ElementTree structure)
-    Returns an iterator providing (event, elem) pairs.
-    Events are start and end
-    events is a list of events to emit - defaults to ["start","end"]
-    tags is a single tag or a list of tags to emit events for - if None or empty list then events are generated for all tags
+# add title and identifier of the artifacts that aren't in the details from get_module_artifact_details()
+# the GETs are independent of each other so they are done in parallel, over the pooled connections of the server
+def add_missing_artifact_details( c, details, artifact_us, workers=16 ):
+    missing_us = [ba_u for ba_u in dict.fromkeys( artifact_us ) if ba_u not in details]
+    if missing_us:
+        with concurrent.futures.ThreadPoolExecutor( max_workers=workers ) as executor:
+            details.update( zip( missing_us, executor.map( lambda ba_u: get_artifact_title_and_id( c, ba_u ), missing_us ) ) )
+    return details
+
+
+
+##################################################################################
+# wait for a task tracker to complete - like c.wait_for_tracker() but polling with exponential backoff (0.05s, 0.1s, 0.2s ... up to 1s)
+# so a quick update is noticed after tens of milliseconds rather than after a full second
+# returns the tracker XML, raises an exception if the tracker finished with an error
+def wait_for_tracker_backoff( c, location, firstinterval=0.05, maxinterval=1.0 ):
+    interval = firstinterval
+    while True:
+        tracker_x = c.execute_get_rdf_xml( location, cacheable=False, intent="Poll tracker until result shows completion" )
+        if _XP_TRACKER_COMPLETE( tracker_x ):
+            if _XP_TRACKER_ERROR( tracker_x ):
+                status = xpath_text( _XP_TRACKER_STATUSCODE, tracker_x ) or "NO STATUS CODE"
+                message = xpath_text( _XP_TRACKER_MESSAGE, tracker_x ) or "NO MESSAGE"
+                raise Exception( f"Updating the structure failed: {status} {message}" )
+            return tracker_x
+        time.sleep( interval )
+        interval = min( interval*2, maxinterval )
+
+
+##################################################################################
+# generator walking the module structure (JSON) - uses an explicit stack rather than recursion
+def json_structure_walk(rooturi,entries):
+    """
+    Module structure iterator
     """
-    # each stack entry consists of a list of the xml element and a second entry initially None
-    # if the second entry is None a start is emitted and all children of current element are put into the second entry
-    # if the second entry is a non-empty list the first item in it is popped and then a new stack entry is created
-    # once the second entry is an empty list, and end is generated and then stack is popped
-    stack = [[root,list(root)]]
-#    tags = tags if type(tags) == list else tags or []
-    tags = [] if tags is None else tags if type(tags) == list else [tags]
-    events = events or ["start","end"]
     def iterator():
+        root = entries[rooturi]
+        # the root itself isn't reported, only its children
+        yield ("startChildren",root)
+        # each stack entry is a binding and an iterator over its children not yet walked
+        stack = [(root,iter(list(root["childBindings"])))]
         while stack:
-            elnow,children = stack[-1]
-            if children is None:
-                # this is the start of elnow so emit a start and put its children into the stack entry
-                if ( not tags or elnow.tag in tags ) and "start" in events:
-                    yield ("start",elnow)
-                # put the children into the top stack entry
-                stack[-1][1] = list(elnow)
-            elif len(children)>0:
-                # do a child and remove it
-                thischild = children.pop(0)
-                # and now create a new stack entry for this child
-                stack.append([thischild,None])                
-            else:
-                # finished these children - emit the end
-                if len(stack)>1 and ( not tags or elnow.tag in tags ) and "end" in events:
-                    yield ("end",elnow)
+            el,children = stack[-1]
+            child_u = next(children,None)
+            if child_u is None:
                 stack.pop()
-    return iterator
-
-def iterwalk1(root, events=None, tags=None):
-    """Recuirsive version - Incrementally walks XML structure (like iterparse but for an existing ElementTree structure)
-    Returns an iterator providing (event, elem) pairs.
-    Events are start and end
-    events is a list of events to emit - defaults to ["start","end"]
-    tags is a single tag or a list of tags to emit events for - if None or empty list then events are generated for all tags
-    """
-    tags = [] if tags is None else tags if type(tags) == list else [tags]
-    events = events or ["start","end"]
-    
-    def recursiveiterator(el,suppressyield=False):
-        if not suppressyield and ( not tags or el.tag in tags ) and "start" in events:
-            yield ("start",el)
-        for child in list(el):
-            yield from recursiveiterator(child)
-        if not suppressyield and  ( not tags or el.tag in tags ) and "end" in events:
-            yield ("end",el)
-            
-    def iterator():
-        yield from recursiveiterator( root, suppressyield=True )
+                yield ("endChildren",el)
+                if stack:
+                    yield ("end",el)
+            else:
+                child = entries[child_u]
+                yield ("start",child)
+                yield ("startChildren",child)
+                stack.append((child,iter(list(child["childBindings"]))))
         
-    return iterator
-
+    return iterator        
 
 
 	
 	
 ##################################################################################
 if __name__=="__main__":
-    if len(sys.argv) != 10:
-        print( 'A typical commandline might be: dn_simple_createartifact.py "Stakeholder Requirement" "My first stakefilder requirement" /' )
-        raise Exception( 'You must provide: The artifact type, the artifact text, and the folder path to create the artifact in - each surrounded by " if including spaces' )
-
-    # take proj and comp from the argument list given to the python script
-    proj = sys.argv[4]
-    comp = sys.argv[5]
-	
-    #provide change set to the poython script
-    conf = sys.argv[6]
-	
+    # batch mode: --batch <file.csv> proj comp conf username password
+    # each row of the CSV file is type,text,folder,module - all the artifacts are created with one login and one structure update per module
+    if len(sys.argv) == 8 and sys.argv[1] == "--batch":
+        with open( sys.argv[2], newline="" ) as f:
+            rows = [row for row in csv.reader( f ) if row]
+        proj, comp, conf, username, password = sys.argv[3:8]
+    elif len(sys.argv) == 10:
+        rows = [ ( sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[7] ) ]
+        # take proj and comp from the argument list given to the python script
+        proj = sys.argv[4]
+        comp = sys.argv[5]
 	
-	#destination of the binded requirement
-    mod = sys.argv[7]
+        #provide change set to the poython script
+        conf = sys.argv[6]
 	
-	#set username and password
-    username = sys.argv[8]
-    password = sys.argv[9]
+        #set username and password
+        username = sys.argv[8]
+        password = sys.argv[9]
+    else:
+        print( 'A typical commandline might be: dn_simple_createartifact.py "Stakeholder Requirement" "My first stakefilder requirement" /' )
+        raise Exception( 'You must provide: The artifact type, the artifact text, and the folder path to create the artifact in - each surrounded by " if including spaces' )
 
 
-    print( f"Attempting to create a '{sys.argv[1]}' in project '{proj}' in configuration {conf} in folder '{sys.argv[3]}'" )
+    for arttype,arttext,folderpath,mod in rows:
+        print( f"Attempting to create a '{arttype}' in project '{proj}' in configuration {conf} in folder '{folderpath}'" )
     print( f"Using credentials user '{username}' password '{password}'")
 
 
@@ -226,6 +358,12 @@ if __name__=="__main__":
     elmserver.setupproxy(jazzhost)
     theserver = elmserver.JazzTeamServer(jazzhost, username, password, verifysslcerts=False, jtsappstring=f"jts:{jtscontext}", appstring='rm4', cachingcontrol=caching)
 
+    # all requests go through the one requests session of the server - enlarge its connection pool so connections are kept alive and reused
+    # the adapters are resized rather than replaced because with caching enabled they are the ones doing the caching
+    for adapter in theserver._session.adapters.values():
+        adapter.init_poolmanager( poolsize, poolsize, block=False )
+    theserver._session.headers['Connection'] = 'keep-alive'
+
     # create the RM application interface
     dnapp = theserver.find_app( f"rm:{rmcontext}", ok_to_create=True )
 	
@@ -244,346 +382,178 @@ if __name__=="__main__":
     print( f"{config_u=}" )
     c.set_local_config(config_u)
 
-    # load the folder (using folder query capability)
-    # NOTE this returns as soon as it finds a matching folder - i.e. doesn't load them all!
-    # thefolder = c.find_folder(sys.argv[3])
-	# modulname muss sein "ConsumerRatings" -> sys.argv[3]
-	 
-    thefolder = c.find_folder(sys.argv[3])
-	
-    if thefolder is None:
-        raise Exception( f"Folder '{sys.argv[3]}' not found!" )
-    print( f"Folder URL = {thefolder.folderuri}" )
-    
     # find the requirement creation factory    
     factory_u, shapes = c.get_factory_uri("oslc_rm:Requirement", return_shapes=True)
     print( f"Factory URL = {factory_u}" )
     print( f"Shapes for this factory: {shapes}" )
-    
-    # Find the type - read the shapes until find one matching the type name on the commandline
-    # If you have two or more shapes with the same name this will only return the last matching one - the order is determined by the server and can vary - i.e. different shapes with the same name is a BAD idea!
-    # Also shows all the shape names :-)
-    theshape_u = None
-    for shape_u in shapes:
-        # retrieve the type
-        shape_x = c.execute_get_rdf_xml( shape_u )
-        # check its name
-        shape_title = rdfxml.xmlrdf_get_resource_text( shape_x, ".//oslc:ResourceShape/dcterms:title" )
-        print( f"{shape_title=}" )
-        if shape_title == sys.argv[1]:
-            theshape_u = shape_u
-            print( f"Found!" )
-    if theshape_u is None:
-        raise Exception( f"Shape '{sys.argv[1]}' not found!" )
+
+    # shape title -> shape URL, so the type of each row is a dictionary lookup
+    shapecache = load_shape_cache()
+    shapetitles = shapecache.setdefault( (comp_u, config_u), {} )
+    # to check a remembered shape is still offered by the factory
+    factoryshapes = set( shapes )
+    # the shapes already read from the server in this run - each is read at most once
+    readshapes = set()
+
+    # the folders found, keyed by path
+    folders = {}
+
+    # the artifacts created, a list per module name - in the order of the rows
+    created = {}
+    # the rows that failed with their exception, and the artifacts created but not bound, a list per module name
+    failed = []
+    unbound = {}
+
+    for arttype,arttext,folderpath,mod in rows:
+        # load the folder (using folder query capability)
+        # NOTE this returns as soon as it finds a matching folder - i.e. doesn't load them all!
+        try:
+            if folderpath not in folders:
+                thefolder = c.find_folder(folderpath)
+                if thefolder is None:
+                    raise Exception( f"Folder '{folderpath}' not found!" )
+                print( f"Folder URL = {thefolder.folderuri}" )
+                folders[folderpath] = thefolder
+            thefolder = folders[folderpath]
+
+            # Find the type - first in the shapes remembered from previous runs for this component+configuration, otherwise forget the shapes the
+            # factory no longer offers and read the shapes not yet read in this run until the type name on the commandline turns up
+            # (so renamed shapes or a new shape reusing a title are picked up without reading all of them)
+            # If you have two or more shapes with the same name this will only return the first matching one - the order is determined by the server and can vary - i.e. different shapes with the same name is a BAD idea!
+            # Also shows the shape names read :-)
+            theshape_u = shapetitles.get( arttype )
+            if theshape_u not in factoryshapes:
+                for shape_title in [t for t,u in shapetitles.items() if u not in factoryshapes]:
+                    del shapetitles[shape_title]
+                for shape_u in shapes:
+                    if shape_u in readshapes:
+                        continue
+                    readshapes.add( shape_u )
+                    # retrieve the type
+                    shape_x = c.execute_get_rdf_xml( shape_u )
+                    # check its name - a renamed shape loses its old title
+                    shape_title = xpath_text( _XP_SHAPE_TITLE, shape_x )
+                    print( f"{shape_title=}" )
+                    for oldtitle in [t for t,u in shapetitles.items() if u == shape_u and t != shape_title]:
+                        del shapetitles[oldtitle]
+                    shapetitles.setdefault( shape_title, shape_u )
+                    if shape_title == arttype:
+                        break
+                theshape_u = shapetitles.get( arttype )
+                save_shape_cache( shapecache )
+            if theshape_u is None:
+                raise Exception( f"Shape '{arttype}' not found!" )
  
  
-    # text of the XML with basic content provided (this is based on example in section 2 of https://jazz.net/library/article/1197
-    # If you want more complex and general purpose data such as custom attributes you probably need to use the instanceShape
-	# see also article https://jazz.net/forum/questions/284861/methodnotallowedexception-while-creating-artifact-in-dng
+            # If you want more complex and general purpose data such as custom attributes you probably need to use the instanceShape
+            # see also article https://jazz.net/forum/questions/284861/methodnotallowedexception-while-creating-artifact-in-dng
 
  
-    if "Requirement" == sys.argv[1]:  # "Requirement" assumed
-	       thexml_t = f"""<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
-         xmlns:dc="http://purl.org/dc/terms/"
-         xmlns:public_rm_10="http://www.ibm.com/xmlns/rm/public/1.0/"
-		 xmlns:jazz_rm="http://jazz.net/ns/rm#"
-         xmlns:calm="http://jazz.net/xmlns/prod/jazz/calm/1.0/"
-         xmlns:rm="http://www.ibm.com/xmlns/rdm/rdf/"
-         xmlns:acp="http://jazz.net/ns/acp#"
-         xmlns:rm_property="https://grarrc.ibm.com:9443/rm/types/"
-         xmlns:oslc="http://open-services.net/ns/core#"
-         xmlns:nav="http://jazz.net/ns/rm/navigation#"
-         xmlns:oslc_rm="http://open-services.net/ns/rm#">
-    <rdf:Description rdf:about="">
-        <rdf:type rdf:resource="http://open-services.net/ns/rm#Requirement"/>
-        <dc:description rdf:parseType="Literal">Holgi was here</dc:description>
-        <jazz_rm:primaryText rdf:parseType="Literal">
-            <div
-                xmlns="http://www.w3.org/1999/xhtml"><p><span>{sys.argv[2]}</span></p>
-            </div>
-        </jazz_rm:primaryText>
-         <dc:title rdf:parseType="Literal">{sys.argv[2]}</dc:title>
-         <oslc:instanceShape rdf:resource="{theshape_u}"/>
-        <nav:parent rdf:resource="{thefolder.folderuri}"/>
-    </rdf:Description>
-        </rdf:RDF>  
-        """
-    else:                  # "Heading" assumed
-	       thexml_t = f"""<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
-         xmlns:dc="http://purl.org/dc/terms/"
-         xmlns:public_rm_10="http://www.ibm.com/xmlns/rm/public/1.0/"
-		 xmlns:jazz_rm="http://jazz.net/ns/rm#"
-         xmlns:calm="http://jazz.net/xmlns/prod/jazz/calm/1.0/"
-         xmlns:rm="http://www.ibm.com/xmlns/rdm/rdf/"
-         xmlns:acp="http://jazz.net/ns/acp#"
-         xmlns:rm_property="https://grarrc.ibm.com:9443/rm/types/"
-         xmlns:oslc="http://open-services.net/ns/core#"
-         xmlns:nav="http://jazz.net/ns/rm/navigation#"
-         xmlns:oslc_rm="http://open-services.net/ns/rm#">
-    <rdf:Description rdf:about="">
-        <rdf:type rdf:resource="http://open-services.net/ns/rm#Requirement"/>
-        <rdf:type rdf:resource="https://hep.continental.com/ns/automotive/rm/ty/heading"/>
-        <rdf:type rdf:resource="http://jazz.net/ns/rm#Text"/>
-        <dc:description rdf:parseType="Literal">Holgi was here</dc:description>
-        <jazz_rm:primaryText rdf:parseType="Literal">
-            <div
-                xmlns="http://www.w3.org/1999/xhtml"><p><span>{sys.argv[2]}</span></p>
-            </div>
-        </jazz_rm:primaryText>
-         <dc:title rdf:parseType="Literal">{sys.argv[2]}</dc:title>
-         <oslc:instanceShape rdf:resource="{theshape_u}"/>
-        <nav:parent rdf:resource="{thefolder.folderuri}"/>
-    </rdf:Description>
-        </rdf:RDF>  
-        """
-	
-	
-    # text of the XML with basic content provided (this is based on example in section 2 of https://jazz.net/library/article/1197
-    # If you want more complex and general purpose data such as custom attributes you probably need to use the instanceShape
-	# see also article https://jazz.net/forum/questions/284861/methodnotallowedexception-while-creating-artifact-in-dng
-
-    thexml_x = ET.fromstring( thexml_t )
+            # fill in a copy of the blank artifact - setting the text on the tree makes sure the title given on the commandline is escaped correctly
+            thexml_x = copy.deepcopy( _BLANK_ARTIFACT_X )
+            thedesc_x = thexml_x.find( 'rdf:Description', NSMAP )
+            if "Requirement" != arttype:  # "Heading" assumed
+                for i,type_u in enumerate( HEADING_TYPES ):
+                    thedesc_x.insert( i+1, ET.Element( rdfxml.uri_to_tag( 'rdf:type' ), { rdfxml.uri_to_tag( 'rdf:resource' ): type_u } ) )
+            thedesc_x.find( 'jazz_rm:primaryText//xhtml:span', NSMAP ).text = arttext
+            thedesc_x.find( 'dc:title', NSMAP ).text = arttext
+            thedesc_x.find( 'oslc:instanceShape', NSMAP ).set( rdfxml.uri_to_tag( 'rdf:resource' ), theshape_u )
+            thedesc_x.find( 'nav:parent', NSMAP ).set( rdfxml.uri_to_tag( 'rdf:resource' ), thefolder.folderuri )
    
 #       <jazz_rm:primaryText rdf:parseType="Literal"><div xmlns="http://www.w3.org/1999/xhtml"><p><span>{sys.argv[2]}</span></p></div></jazz_rm:primaryText>
 # https://jazz.net/library/article/1197
 # <jazz_rm:primaryText rdf:parsetype="Literal"><br><div><br><p dir="ltr" id="_1514027293925">Test Feature</p><br><p dir="ltr" id="_1514043060313"></p><br><p dir="ltr" id="_1514043748017"></p><br><p dir="ltr" id="_1514043748018"></p><br> </div><br></jazz_rm:primaryText>	
  
    
-    # POST it to create the artifact
-    response = c.execute_post_rdf_xml( factory_u, data=thexml_x, intent="Create the artifact"  )
-    print( f"POST result = {response.status_code}" )
-    location = response.headers.get('Location')
-    if response.status_code != 201:
-        raise Exception( "POST failed!" )
-    theartifact_u = location
+            # POST it to create the artifact
+            response = c.execute_post_rdf_xml( factory_u, data=thexml_x, intent="Create the artifact"  )
+            print( f"POST result = {response.status_code}" )
+            location = response.headers.get('Location')
+            if response.status_code != 201:
+                raise Exception( "POST failed!" )
+            theartifact_u = location
+            # remember it straight away so it is bound even if showing its id below fails
+            created.setdefault( mod, [] ).append( theartifact_u )
     
-    # get the artifact so we can show its id
-    theartifact_x = c.execute_get_rdf_xml( theartifact_u, intent="Retrieve the artifact so we can show its identifier" )
+            # get the artifact so we can show its id
+            theartifact_x = c.execute_get_rdf_xml( theartifact_u, cacheable=False, intent="Retrieve the artifact so we can show its identifier" )
     
-    # show its ID
-    theid = rdfxml.xml_find_element( theartifact_x, ".//dcterms:identifier" )
-    print( f"Your new artifact has identifier {theid.text} URL {theartifact_u}" )
+            # show its ID
+            theid = _XP_IDENTIFIER( theartifact_x )[0]
+            print( f"Your new artifact has identifier {theid.text} URL {theartifact_u}" )
+        except Exception as e:
+            # one bad row doesn't stop the batch - the artifacts already created are still bound into their modules below
+            print( f"Row {arttype!r} {arttext!r} {folderpath!r} {mod!r} failed: {e}" )
+            failed.append( ( (arttype,arttext,folderpath,mod), e ) )
 	
 	
 	
-	    # create our "server" which is how we connect to DOORS Next
-    # first enable the proxy so if a proxy is running it can monitor the communication with server (this is ignored if proxy isn't running)
-    elmserver.setupproxy(jazzhost)
-    theserver = elmserver.JazzTeamServer(jazzhost, username, password, verifysslcerts=False, jtsappstring=f"jts:{jtscontext}", appstring='rm4', cachingcontrol=caching)
-
-    # create the RM application interface
-    dnapp = theserver.find_app( f"rm:{rmcontext}", ok_to_create=True )
-
-    # open the project
-    p = dnapp.find_project(proj)
-
-    # find the component
-    c = p.find_local_component(comp)
-    comp_u = c.project_uri
-    print( f"{comp_u=}" )
-
-    # select the configuration
-    config_u = c.get_local_config(conf)
-    print( f"{config_u=}" )
-    c.set_local_config(config_u)
-
-    # find the module - using OSLC Query
+    # the server, project, component and configuration opened above are reused to bind the artifacts into the modules
 
     # get the query capability base URL for requirements
     qcbase = c.get_query_capability_uri("oslc_rm:Requirement")
 
-    # query for a title and for format=module
-    modules = c.execute_oslc_query(
-        qcbase,
-        whereterms=[['dcterms:title','=',f'"{mod}"'], ['rdf:type','=','<http://jazz.net/ns/rm#Module>']],
-        select=['*'],
-        prefixes={rdfxml.RDF_DEFAULT_PREFIX["dcterms"]:'dcterms'} # note this is referest - url to prefix
-        )
+    # doesn't change during the walk so look it up only once
+    baseurl = c.app.baseurl
+
+    for mod,toinsert_us in created.items():
+        # find the module - using OSLC Query
+        # query for a title and for format=module
+        try:
+            modules = c.execute_oslc_query(
+                qcbase,
+                whereterms=[['dcterms:title','=',f'"{mod}"'], ['rdf:type','=','<http://jazz.net/ns/rm#Module>']],
+                select=['*'],
+                prefixes={rdfxml.RDF_DEFAULT_PREFIX["dcterms"]:'dcterms'} # note this is referest - url to prefix
+                )
         
-    if len(modules)==0:
-        raise Exception( f"No module '{mod}' with that name in project {proj} component {comp} configuration {conf}" )
-    elif len(modules)>1:
-        for k,v in modules.items():
-            print( f'{k} {v.get("dcterms:title","")}' )
-        raise Exception( "More than one module with that name in project {proj} component {comp} configuraition {conf}" )
+            if len(modules)==0:
+                raise Exception( f"No module '{mod}' with that name in project {proj} component {comp} configuration {conf}" )
+            elif len(modules)>1:
+                for k,v in modules.items():
+                    print( f'{k} {v.get("dcterms:title","")}' )
+                raise Exception( "More than one module with that name in project {proj} component {comp} configuraition {conf}" )
 
-    # we've found the module, it's the only entry in the modules dictionary, keyed by URL
-    themodule_u = list(modules.keys())[0]
-    print( f"{themodule_u=}" )
+            # we've found the module, it's the only entry in the modules dictionary, keyed by URL
+            themodule_u = list(modules.keys())[0]
+            print( f"{themodule_u=}" )
 
-    mod_x = c.execute_get_rdf_xml(themodule_u, cacheable=False,  headers={'vvc.configuration': config_u,'DoorsRP-Request-Type':'public 2.0', 'Referer': None, 'OSLC-Core-Version': None, 'Configuration-Context': None}, intent="Retrieve the module RDF-XML to get the structure URI" ) # have to remove the OSLC-Core-Version and Configuration-Context headers, and provide vvc.configuration header
+            mod_x = c.execute_get_rdf_xml(themodule_u, cacheable=False,  headers={'vvc.configuration': config_u,'DoorsRP-Request-Type':'public 2.0', 'Referer': None, 'OSLC-Core-Version': None, 'Configuration-Context': None}, intent="Retrieve the module RDF-XML to get the structure URI" ) # have to remove the OSLC-Core-Version and Configuration-Context headers, and provide vvc.configuration header
 
-    print( f"{mod_x=}" )
+            print( f"{mod_x=}" )
 
-    # report the structure
+            # report the structure
 
-    structure_u = rdfxml.xmlrdf_get_resource_uri( mod_x, ".//rm_modules:structure" )
-    print( f"{structure_u=}" )
+            structure_u = next( iter( _XP_STRUCTURE( mod_x ) ), None )
+            print( f"{structure_u=}" )
 
-    if (len(theid.text)>0):
-        # second argument is an ID - it *MUST* be in the same configuration as the module!
-        # first find the artifact to insert, using OSLC Query
-        # query for a title and for format=module
-        toinserts = c.execute_oslc_query(
-            qcbase,
-            whereterms=[['dcterms:identifier','=',theid.text]],
-            select=['*'],
-            prefixes={rdfxml.RDF_DEFAULT_PREFIX["dcterms"]:'dcterms'}
-            )
-            
-        if len(toinserts)==0:
-            raise Exception( f"No artifact '{theid.text}' with that name in project {proj} component {comp} configuration {conf}" )
-        elif len(toinserts)>1:
-            toinsert_u = None
-            for k,v in toinserts.items():
-                # find the first one with a rm_nav:parent
-                folder = v.get("rm_nav:parent")
-                if folder is not None:
-                    toinsert_u = k
-                    break
-            if toinsert_u is None:
-                raise Exception( f"No artifact {theid.text} found with a folder" )
-        else:
-            toinsert_u = list(toinserts.keys())[0]
-        print( f"{toinsert_u=}" )
-        
-    if format == "RDFXML":
-        # retrieve the structure element in RDF-XML
-        modstructure_x = c.execute_get_rdf_xml(structure_u, cacheable=False, headers={'vvc.configuration': config_u,'DoorsRP-Request-Type':'public 2.0', 'OSLC-Core-Version': None, 'Configuration-Context': None}, intent="Retrieve module structure (XML)" ) # have to remove the OSLC-Core-Version and Configuration-Context headers, and provide vvc.configuration header
-
-        if (theid>0):            
-            # toinsert is already prepared
-            # get the etag
-            response, etag = c.execute_get_rdf_xml(structure_u, cacheable=False, headers={'vvc.configuration': config_u,'DoorsRP-Request-Type':'public 2.0', 'OSLC-Core-Version': None, 'Configuration-Context': None}, return_etag=True, intent="Retrieve module structure (XML)"  ) # have to remove the OSLC-Core-Version and Configuration-Context headers, and provide vvc.configuration header
-            print( f"{etag=}" )
-            # insert a reference to it in a hardcoded location
-            firsthead_x = rdfxml.xml_find_elements(modstructure_x,'rm_modules:Binding/rm_modules:childBindings/rm_modules:Binding/rm_modules:childBindings')[0]
-            print( f"{firsthead_x=}" )
-#        <rm_modules:childBindings rdf:parseType="Collection">
-#            <rm_modules:Binding rdf:about="https://clmwb.com:9444/rdm/resources/MB_2f75a3f310ec42ccadb68e4442617a74">
-#                <rm_modules:isHeading rdf:datatype="http://www.w3.org/2001/XMLSchema#boolean">true</j.0:isHeading>
-#                <oslc_config:component rdf:resource="https://clmwb.com:9444/rdm/cm/component/_Y5OakLruEeevMtDqCXe--Q"/>
-#                <rm_modules:boundArtifact rdf:resource="https://clmwb.com:9444/rdm/resources/CA_3a7b45d1caa540d485ffc9832b802d47"/>
-#                <rm_modules:module rdf:resource="https://clmwb.com:9444/rdm/resources/_4sscEb43EeeD0-df1VhHuw"/>
-#                <rm_modules:childBindings rdf:parseType="Collection">
-
-#            s1 = ET.SubElement( firsthead_x )
-
-            # add a new childbinding
-#                    <rm_modules:Binding rdf:about="https://clmwb.com:9444/rdm/resources/_4sscEb43EeeD0-df1VhHuw/structure#1">
-#                        <oslc_config:component rdf:resource="https://clmwb.com:9444/rdm/cm/component/_Y5OakLruEeevMtDqCXe--Q"/>
-#                        <rm_modules:boundArtifact rdf:resource="https://clmwb.com:9444/rdm/resources/CA1"/>
-#                        <rm_modules:module rdf:resource="https://clmwb.com:9444/rdm/resources/_4sscEb43EeeD0-df1VhHuw"/>
-#                        <rm_modules:childBindings rdf:resource="http://www.w3.org/1999/02/22-rdf-syntax-ns#nil"/>
-#                    </rm_modules:Binding>
-            newbinding = ET.fromstring(
-                f"""<rm_modules:Binding
-                            xmlns:rdf='{rdfxml.RDF_DEFAULT_PREFIX["rdf"]}'
-                            xmlns:oslc_config='{rdfxml.RDF_DEFAULT_PREFIX["oslc_config"]}'
-                            xmlns:rm_modules='{rdfxml.RDF_DEFAULT_PREFIX["rm_modules"]}'
-                            rdf:about="https://clmwb.com:9444/rdm/resources/_4sscEb43EeeD0-df1VhHuw/structure#1">
-                        <oslc_config:component rdf:resource="{comp_u}"/>
-                        <rm_modules:boundArtifact rdf:resource="{toinsert_u}"/>
-                        <rm_modules:module rdf:resource="{themodule_u}"/>
-                        <rm_modules:childBindings rdf:resource="http://www.w3.org/1999/02/22-rdf-syntax-ns#nil"/>
-                    </rm_modules:Binding>
-                """
-                )
-            print( f"{newbinding=}" )
-            firsthead_x.append(newbinding)
-            
-            # PUT the new structure and wait for it to be saved
-            response = c.execute_post_rdf_xml( structure_u, data=modstructure_x, put=True, cacheable=False, headers={'If-Match':etag,'vvc.configuration': config_u,'DoorsRP-Request-Type':'public 2.0', 'OSLC-Core-Version': None, 'Configuration-Context': None}, intent="Update module structure (XML)"  )
-            print( f"{response.status_code}" )
-            location = response.headers.get('Location')
-            if response.status_code == 202 and location is not None:
-                # wait for the tracker to finished
-                result = c.wait_for_tracker( location, interval=1.0, progressbar=True, msg=f"Updating Structure")
-                time.sleep( 0.5 )
-                    
-            # get the structure again
-            modstructure_x = c.execute_get_rdf_xml(structure_u, cacheable=False, headers={'vvc.configuration': config_u,'DoorsRP-Request-Type':'public 2.0', 'OSLC-Core-Version': None, 'Configuration-Context': None}, intent="Retrieve module structure (XML) after update"  ) # have to remove the OSLC-Core-Version and Configuration-Context headers, and provide vvc.configuration header
-            
-        # find the root binding
-        modroot_x = rdfxml.xml_find_element( modstructure_x, './rm_modules:Binding' )
+            # the artifacts to insert are the ones created above - the URL from the POST is the artifact in this configuration so there's no need to query for it
+            print( f"{toinsert_us=}" )
 
-            
-        # Now explore the structure for childBinding (which corresponds to nesting) and Binding (which is a binding of an artifact into the module)
-        it = iterwalk1(modroot_x, events=["start","end"], tags=[rdfxml.uri_to_tag('rm_modules:childBindings'),rdfxml.uri_to_tag("rm_modules:Binding")] )
-        print( f"{it=}" )
-        level = 0
+            # retrieve the module structure in JSON - parsed here rather than by execute_get_json so orjson can be used
+            response = c.execute_get_raw(structure_u, cacheable=False, headers={'Accept': 'text/json', 'vvc.configuration': config_u,'DoorsRP-Request-Type':'public 2.0', 'OSLC-Core-Version': None, 'Configuration-Context': None}, intent="Retrieve module structure (JSON)"  ) # have to remove the OSLC-Core-Version and Configuration-Context headers, and provide vvc.configuration header
+            modstructure_j = json_loads( response.content )
 
-        headinglevel = [] # heading level is a list of two-element lists - first is the heading number, second is the non-heading number
-
-        for event,el in it():
-            logger.info( f"{event=} {el.tag=} {headinglevel=}" )
-            
-            # childBinding is an increase in nesting of headings
-            if el.tag==rdfxml.uri_to_tag("rm_modules:childBindings"):
-                if event == "start":
-                    level += 1
-                    headinglevel.append([0,0])
-                if event == "end":
-                    level -= 1
-                    headinglevel.pop()
-                    
-            # Binding is an artifact
-            if el.tag==rdfxml.uri_to_tag("rm_modules:Binding"):
-                # if it's a heading this increments section differently from non-heading
-                isheading = ( rdfxml.xmlrdf_get_resource_text( el, './rm_modules:isHeading' ) == "true" )
-                logger.info( f"{isheading=}" )
-                
-                if event=="start":
-                    # retrieve the title of the artifact, only needed in the "start"
-                    ba_u = rdfxml.xmlrdf_get_resource_uri( el, './rm_modules:boundArtifact' )
-                    if ba_u and ba_u.startswith( c.app.baseurl ):
-                        req_x = c.execute_get_rdf_xml( ba_u, intent="Retrieve artifact detail to get title and identifier"  )
-                        summary = rdfxml.xmlrdf_get_resource_text( req_x,'.//dcterms:title')
-                        id = rdfxml.xmlrdf_get_resource_text( req_x,'.//dcterms:identifier')
-                    else:
-                        summary = "TOP LEVEL"
-                        id = "-"
-                        raise Exception( f"Unexpected: No or invalid artifact URI {ba_u}" )
-                    if isheading:
-                        # increment the heading number and reset the sub-number
-                        headinglevel[-1][0] += 1
-                        headinglevel[-1][1] = 0
-                    else:
-                        # increment the sub-number
-                        headinglevel[-1][1] += 1
-                    # report the current item
-                    print( f"{id}{'    '*level}", end="" )
-                    if True or isheading:
-                        # NOTE NOTE NOTE the section number calculation has not been fully verified/checked - it seems to work after superficial inspection
-                        h = getsectionnumber(headinglevel)
-                        print( f"{h}", end="" )
-                    print( f"  {summary}" )
-
-    elif format == "JSON":
-        # retrieve the structure element in RDF-XML
-        modstructure_j = c.execute_get_json(structure_u, cacheable=False, headers={'vvc.configuration': config_u,'DoorsRP-Request-Type':'public 2.0', 'OSLC-Core-Version': None, 'Configuration-Context': None}, intent="Retrieve module structure (JSON)"  ) # have to remove the OSLC-Core-Version and Configuration-Context headers, and provide vvc.configuration header
-
-        if (len(theid.text)>0):     
             # Following code harcodes location where new binding is inserted, so need the root to be the first element in the structure list
             if not modstructure_j[0]["isStructureRoot"]:
                 raise Exception( "Root not at start of structure!" )
-            # toinsert is already prepared
-            # get the etag
-            response,etag = c.execute_get_rdf_xml(
+            # get the etag - only the header is needed, so the RDF-XML of the structure isn't parsed
+            response = c.execute_get_raw(
                 structure_u,
                 cacheable=False,
                 headers={
+                    'Accept': 'application/rdf+xml',
                     'vvc.configuration': config_u,
                     'DoorsRP-Request-Type':'public 2.0',
                     'OSLC-Core-Version': None,
                     'Configuration-Context': None
                 },
-                return_etag=True,
-                intent="Retrieve module structure (JSON)"
+                intent="Retrieve module structure ETag"
             )
+            etag = response.headers['ETag']
             # have to remove the OSLC-Core-Version and Configuration-Context headers, and provide vvc.configuration header
             print( f"{etag=}" )
-            # insert a reference to it in a hardcoded location
+            # insert a reference to each artifact in a hardcoded location
             # this is a very blunt method - a tidier method would be to find the section and insert at that location
 #{
 #  "uri" : "https://jazz.ibm.com:9443/rm/resources/BI__yq5s0B6Eeuh3Iiax2L3Ow",
@@ -594,30 +564,38 @@ if __name__=="__main__":
 #  "boundArtifact" : "https://jazz.ibm.com:9443/rm/resources/TX__2GBIkB6Eeuh3Iiax2L3Ow",
 #  "childBindings" : [ ]
 #}          
-            tempbinding_u = "https://clmwb.com:9444/rdm/resources/_4sscEb43EeeD0-df1VhHuw/structure#1"
-            newbinding = {
-                    "uri": tempbinding_u,
-                    "component": comp_u,
-                    "type": "dng_module:Binding",
-                    "module": themodule_u,
-                    "boundArtifact": toinsert_u,
-                    "childBindings": []
-                }
-            # this assumes the root is the first entry!
-            modstructure_j[0]["childBindings"].append(tempbinding_u)
-            modstructure_j.append(newbinding)
-            # PUT the new structure and wait for it to be saved
-            response = c.execute_post_json( structure_u, data=modstructure_j, put=True, cacheable=False, headers={'If-Match':etag,'vvc.configuration': config_u,'DoorsRP-Request-Type':'public 2.0', 'OSLC-Core-Version': None, 'Configuration-Context': None}, intent="Update the module structure (JSON)"  )
+            for i,toinsert_u in enumerate( toinsert_us, 1 ):
+                tempbinding_u = f"https://clmwb.com:9444/rdm/resources/_4sscEb43EeeD0-df1VhHuw/structure#{i}"
+                newbinding = {
+                        "uri": tempbinding_u,
+                        "component": comp_u,
+                        "type": "dng_module:Binding",
+                        "isHeading": False,
+                        "module": themodule_u,
+                        "boundArtifact": toinsert_u,
+                        "childBindings": []
+                    }
+                # this assumes the root is the first entry!
+                modstructure_j[0]["childBindings"].append(tempbinding_u)
+                modstructure_j.append(newbinding)
+            # PUT the new structure (all the new bindings in one update) and wait for it to be saved
+            # sent with execute_post_content as execute_post_json only accepts a str body, which would be encoded as latin-1
+            response = c.execute_post_content( structure_u, data=json_dumps( modstructure_j ), put=True, cacheable=False, headers={'Accept': 'application/json', 'Content-Type': 'application/json', 'If-Match':etag,'vvc.configuration': config_u,'DoorsRP-Request-Type':'public 2.0', 'OSLC-Core-Version': None, 'Configuration-Context': None}, intent="Update the module structure (JSON)"  )
             print( f"{response.status_code}" )
             location = response.headers.get('Location')
             if response.status_code == 202 and location is not None:
                 # wait for the tracker to finished
-                result = c.wait_for_tracker( location, interval=1.0, progressbar=True, msg=f"Updating Structure")
-                time.sleep( 0.5 )
-            
-            # get the structure again afer the update
-            modstructure_j = c.execute_get_json(structure_u, cacheable=False, headers={'vvc.configuration': config_u,'DoorsRP-Request-Type':'public 2.0', 'OSLC-Core-Version': None, 'Configuration-Context': None}, intent="Retrieve module structure (JSON) after update"  ) # have to remove the OSLC-Core-Version and Configuration-Context headers, and provide vvc.configuration header
-            sys.exit(0)
+                result = wait_for_tracker_backoff( c, location )
+        except Exception as e:
+            # the artifacts exist but aren't in the module - keep going with the other modules and list them at the end
+            print( f"Binding into module '{mod}' failed: {e}" )
+            unbound[mod] = toinsert_us
+            continue
+
+        if not report:
+            continue
+
+        # walk the structure as updated above rather than retrieving it again - apart from the URIs the server gives the new bindings it is what the server now has
         # scan all the entries into a dictionary keyed by the URL
         entries = {}
         for s in modstructure_j:
@@ -626,72 +604,71 @@ if __name__=="__main__":
         # find the root binding
         modroot = entries[structure_u]
 
-        # generator recursively walking the structure
-        def json_structure_walk(rooturi,entries):
-            """
-            Module structure recursive iterator
-            """
-            def recursiveiterator(uri,suppressyield=False):
-#                print( f"starting {uri}" )
-                if not suppressyield:
-                    yield ("start",entries[uri])
-                yield ("startChildren",entries[uri])
-                for child in list(entries[uri]["childBindings"]):
-                    yield from recursiveiterator(child)
-                yield ("endChildren",entries[uri])
-                if not suppressyield:
-                    yield ("end",entries[uri])
-#                print( f"ending {uri}" )
-                    
-            def iterator():
-                yield from recursiveiterator( rooturi, suppressyield=True )
-                
-            return iterator        
-
         # Now explore the structure for childBinding (which corresponds to nesting) and Binding (which is a binding of an artifact into the module)
         it = json_structure_walk(structure_u,entries )
 #        print( f"{it=}" )
         level = 0
 
-        headinglevel = [] # heading level is a list of two-element lists - first is the heading number, second is the non-heading number
+        # the heading number and the non-heading number for each level of nesting - grown when the nesting gets deeper
+        headings = array.array( 'i', [0]*32 )
+        subs = array.array( 'i', [0]*32 )
+
+        # get titles and identifiers of all the artifacts in the module up front
+        details = get_module_artifact_details( c, qcbase, themodule_u )
+        add_missing_artifact_details( c, details, [e["boundArtifact"] for e in entries.values() if not e.get("isStructureRoot") and e["boundArtifact"].startswith( baseurl )] )
+
+        # the report is collected and written to stdout in chunks of about 4KB rather than with several prints per artifact
+        out = io.StringIO()
 
         for event,el in it():
-            
+
             # childBinding is an increase in nesting of headings
             if event == "startChildren":
                 level += 1
-                headinglevel.append([0,0])
-            if event == "endChildren":
+                if level == len(headings):
+                    headings.extend( [0]*len(headings) )
+                    subs.extend( [0]*len(subs) )
+                headings[level] = 0
+                subs[level] = 0
+            elif event == "endChildren":
                 level -= 1
-                headinglevel.pop()
-                    
-            isheading = el["isHeading"]
-            
-            if event=="start":
+            elif event=="start":
+                isheading = el["isHeading"]
                 # retrieve the title of the artifact, only needed in the "start"
-                ba_u = el["uri"]
-                if ba_u.startswith( c.app.baseurl ):
-                    req_x = c.execute_get_rdf_xml( ba_u, intent="Retrieve artifact details to get the title and identifier"  )
-                    summary = rdfxml.xmlrdf_get_resource_text( req_x,'.//dcterms:title')
-                    id = rdfxml.xmlrdf_get_resource_text( req_x,'.//dcterms:identifier')
+                ba_u = el["boundArtifact"]
+                if ba_u.startswith( baseurl ):
+                    summary,id = details[ba_u]
                 else:
                     summary = "TOP LEVEL"
                     id = "-"
                     raise Exception( f"Unexpected: No or invalid artifact URI {ba_u}" )
                 if isheading:
                     # increment the heading number and reset the sub-number
-                    headinglevel[-1][0] += 1
-                    headinglevel[-1][1] = 0
+                    headings[level] += 1
+                    subs[level] = 0
                 else:
                     # increment the sub-number
-                    headinglevel[-1][1] += 1
+                    subs[level] += 1
                 # report the current item
-                print( f"{id}{'    '*level}", end="" )
+                out.write( f"{id}{_INDENT[level] if level < len(_INDENT) else '    '*level}" )
                 if True or isheading:
                     # NOTE NOTE NOTE the section number calculation has not been fully verified/checked - it seems to work after superficial inspection
-                    h = getsectionnumber(headinglevel)
-                    print( f"{h}", end="" )
-                print( f"  {summary}" )
-
-    else:
-        raise Exception( f"Invalid format {format}" )
\ No newline at end of file
+                    h = getsectionnumber(headings, subs, level)
+                    out.write( h )
+                out.write( f"  {summary}\n" )
+                if out.tell() > 4096:
+                    sys.stdout.write( out.getvalue() )
+                    out.seek( 0 )
+                    out.truncate()
+
+        sys.stdout.write( out.getvalue() )
+        sys.stdout.flush()
+
+    # report what didn't work - created but unbound artifacts have to be bound by hand (or deleted) as they are orphans in their folder
+    if failed or unbound:
+        for row,e in failed:
+            print( f"FAILED row {row}: {e}" )
+        for mod,toinsert_us in unbound.items():
+            for toinsert_u in toinsert_us:
+                print( f"NOT BOUND into module '{mod}': {toinsert_u}" )
+        raise Exception( f"{len(failed)} row(s) failed, {sum(len(us) for us in unbound.values())} artifact(s) created but not bound" )
\ No newline at end of file
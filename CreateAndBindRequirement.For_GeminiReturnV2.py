@@ -11,11 +11,23 @@
 #
 # ********************************************************************************************************************************
 
+import concurrent.futures
+import dbm
+import json
 import logging
 import os.path
+import pickle
+import shelve
 import sys
+import threading
 import lxml.etree as ET
 import argparse # Bessere Methode zur Verarbeitung von Kommandozeilenargumenten
+import collections
+import csv
+import functools
+from lxml.builder import ElementMaker
+import requests
+from urllib3.util.retry import Retry
 
 # Importiere die benötigten ELM-Client-Module
 import elmclient.server as elmserver
@@ -25,32 +37,72 @@ import elmclient.rdfxml as rdfxml
 # Globale Variable für den Logger
 logger = logging.getLogger(__name__)
 
+# Datei für den ETag-Cache der bedingten GETs (im Cache-Verzeichnis des Benutzers) - zum Leeren einfach löschen
+ETAG_CACHE_FILE = os.path.expanduser("~/.cache/gemini_exchange/etag_cache")
+_etag_cache_lock = threading.Lock()
+# Fehler beim Lesen/Schreiben des ETag-Caches (fehlende, gesperrte oder beschädigte Datei) - sie gelten als Cache-Fehltreffer
+_ETAG_CACHE_ERRORS = (OSError, EOFError, pickle.UnpicklingError) + dbm.error
+
+# Zuordnung Shape-Titel -> Shape-URL je Komponente und Konfiguration, wird zwischen den Aufrufen in einer JSON-Datei gespeichert
+SHAPE_CACHE_FILE = os.path.expanduser("~/.cache/gemini_exchange/shapes.json")
+_shape_cache = None
+# schützt _shape_cache und die Datei; je Komponente+Konfiguration liest nur ein Thread die Shapes (die anderen warten auf sein Ergebnis)
+_shape_cache_lock = threading.Lock()
+_shape_key_locks = collections.defaultdict(threading.Lock)
+
+# Parallele Shape-Abrufe, wenn die Titel einer Komponente noch nicht bekannt sind
+SHAPE_WORKERS = 8
+
+# Anzahl paralleler Erstellungen im Batch-Betrieb (nicht größer als der Verbindungspool, siehe configure_session)
+BATCH_WORKERS = 8
+
+# Ein Lock je Modul-URL: das Einbinden in dieselbe Modulstruktur muss serialisiert werden, sonst kollidieren die ETags (412)
+_module_bind_locks = collections.defaultdict(threading.Lock)
+_module_bind_locks_lock = threading.Lock()
+
+# Einmal kompilierte XPath-Ausdrücke (statt die XPath-Zeichenkette bei jedem Aufruf neu zu parsen)
+_XP_SHAPE_TITLE = ET.XPath('.//oslc:ResourceShape/dcterms:title/text()', namespaces=rdfxml.RDF_DEFAULT_PREFIX)
+_XP_IDENTIFIER = ET.XPath('.//dcterms:identifier/text()', namespaces=rdfxml.RDF_DEFAULT_PREFIX)
+_XP_STRUCTURE = ET.XPath('.//rm_modules:structure/@rdf:resource', namespaces=rdfxml.RDF_DEFAULT_PREFIX)
+_XP_CHILD_BINDINGS = ET.XPath('rm_modules:Binding/rm_modules:childBindings', namespaces=rdfxml.RDF_DEFAULT_PREFIX)
+
+# Namensräume und Element-Fabriken für das RDF-XML eines neuen Artefakts
+NSMAP = {
+    'rdf': "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    'dc': "http://purl.org/dc/terms/",
+    'jazz_rm': "http://jazz.net/ns/rm#",
+    'oslc': "http://open-services.net/ns/core#",
+    'nav': "http://jazz.net/ns/rm/navigation#",
+}
+XHTML_NS = "http://www.w3.org/1999/xhtml"
+_RDF = ElementMaker(namespace=NSMAP['rdf'], nsmap=NSMAP)
+_DC = ElementMaker(namespace=NSMAP['dc'], nsmap=NSMAP)
+_JAZZ_RM = ElementMaker(namespace=NSMAP['jazz_rm'], nsmap=NSMAP)
+_OSLC = ElementMaker(namespace=NSMAP['oslc'], nsmap=NSMAP)
+_NAV = ElementMaker(namespace=NSMAP['nav'], nsmap=NSMAP)
+_XHTML = ElementMaker(namespace=XHTML_NS, nsmap={None: XHTML_NS})
+_RDF_ABOUT = f"{{{NSMAP['rdf']}}}about"
+_RDF_RESOURCE = f"{{{NSMAP['rdf']}}}resource"
+_RDF_PARSETYPE = f"{{{NSMAP['rdf']}}}parseType"
+
 # =================================================================================================
 # HILFSFUNKTIONEN
 # =================================================================================================
-# (Hier stehen die unveränderten Hilfsfunktionen wie 'iterwalk')
-
-def iterwalk(root, events=None, tags=None):
-    """Incrementally walks XML structure (like iterparse but for an existing ElementTree structure)"""
-    stack = [[root, list(root)]]
-    tags = [] if tags is None else tags if type(tags) == list else [tags]
-    events = events or ["start", "end"]
-    def iterator():
-        while stack:
-            elnow, children = stack[-1]
-            if children is None:
-                if (not tags or elnow.tag in tags) and "start" in events:
-                    yield ("start", elnow)
-                stack[-1][1] = list(elnow)
-            elif len(children) > 0:
-                thischild = children.pop(0)
-                stack.append([thischild, None])
-            else:
-                if len(stack) > 1 and (not tags or elnow.tag in tags) and "end" in events:
-                    yield ("end", elnow)
-                stack.pop()
-    return iterator
-    
+
+def xpath_first(xpath, xml):
+    """Liefert das erste Ergebnis eines kompilierten XPath-Ausdrucks (Text oder Attribut), '' wenn es keines gibt."""
+    result = xpath(xml)
+    return str(result[0]) if result else ''
+
+def identifier_from_post_response(response):
+    """Liest dcterms:identifier aus der POST-Antwort, wenn der Server 'return=representation' angewandt hat, sonst ''."""
+    if 'return=representation' not in response.headers.get('Preference-Applied', '') or not response.content:
+        return ''
+    try:
+        return xpath_first(_XP_IDENTIFIER, ET.fromstring(response.content))
+    except ET.XMLSyntaxError:
+        return ''
+
 # =================================================================================================
 # MODULARE FUNKTIONEN
 # =================================================================================================
@@ -65,6 +117,126 @@ def setup_logging(loglevel="INFO,OFF"):
     utils.setup_logging(filelevel=levels[0], consolelevel=levels[1])
     logger.info("Logging initialisiert.")
 
+def configure_session(session, pool_connections=4, pool_maxsize=16):
+    """
+    Konfiguriert die requests-Session, über die elmclient alle Anfragen schickt: Connection-Pool mit Keep-Alive und
+    Wiederholung, wenn die Verbindung nicht aufgebaut werden konnte. Die vorhandenen Adapter werden angepasst statt
+    ersetzt, da sie bei aktivem Caching das Caching übernehmen.
+    """
+    for adapter in session.adapters.values():
+        adapter.init_poolmanager(pool_connections, pool_maxsize, block=False)
+        # Nur Verbindungsaufbau-Fehler - die Anfrage hat den Server dann nie erreicht, auch ein POST wird also nicht doppelt
+        # ausgeführt. Lese- und Statusfehler wiederholt ausschließlich elmclient selbst (_execute_request), sonst multiplizieren sich die Versuche
+        adapter.max_retries = Retry(total=3, connect=3, read=0, status=0, other=0, allowed_methods=Retry.DEFAULT_ALLOWED_METHODS, backoff_factor=0.2)
+    session.headers['Connection'] = 'keep-alive'
+
+def build_artifact_xml(artifact_type, artifact_title, shape_uri, folder_uri):
+    """
+    Baut das RDF-XML für ein neues Artefakt direkt als Baum auf (ohne Text-Vorlage und erneutes Parsen).
+    Der Titel wird dabei von lxml korrekt maskiert.
+    """
+    types = [_RDF.type({_RDF_RESOURCE: "http://open-services.net/ns/rm#Requirement"})]
+    if artifact_type == "Heading":
+        types.append(_RDF.type({_RDF_RESOURCE: "https://hep.continental.com/ns/automotive/rm/ty/heading"}))
+        types.append(_RDF.type({_RDF_RESOURCE: "http://jazz.net/ns/rm#Text"}))
+    return _RDF.RDF(
+        _RDF.Description(
+            {_RDF_ABOUT: ""},
+            *types,
+            _DC.description({_RDF_PARSETYPE: "Literal"}, "Erstellt durch Python-Skript"),
+            _JAZZ_RM.primaryText({_RDF_PARSETYPE: "Literal"}, _XHTML.div(_XHTML.p(_XHTML.span(artifact_title)))),
+            _DC.title({_RDF_PARSETYPE: "Literal"}, artifact_title),
+            _OSLC.instanceShape({_RDF_RESOURCE: shape_uri}),
+            _NAV.parent({_RDF_RESOURCE: folder_uri}),
+        )
+    )
+
+def get_rdf_xml_conditional(component, uri, intent=None):
+    """
+    Holt ein RDF-XML-Dokument per bedingtem GET. ETag und Inhalt werden auf der Platte gespeichert (Schlüssel:
+    Konfiguration + URL) und mit If-None-Match erneut angefragt - bei 304 wird der gespeicherte Inhalt verwendet.
+    """
+    key = f"{component.local_config} {uri}"
+    try:
+        with _etag_cache_lock, shelve.open(ETAG_CACHE_FILE, flag='r') as cache:
+            cached = cache.get(key)
+    except _ETAG_CACHE_ERRORS:
+        cached = None
+    headers = {'Accept': 'application/rdf+xml', 'OSLC-Core-Version': '2.0'}
+    if cached is not None:
+        headers['If-None-Match'] = cached[0]
+    response = component.execute_get_raw(uri, headers=headers, cacheable=False, intent=intent)
+    if response.status_code == 304 and cached is not None:
+        return ET.fromstring(cached[1])
+    etag = response.headers.get('ETag')
+    if etag:
+        try:
+            with _etag_cache_lock:
+                os.makedirs(os.path.dirname(ETAG_CACHE_FILE), exist_ok=True)
+                with shelve.open(ETAG_CACHE_FILE) as cache:
+                    cache[key] = (etag, response.content)
+        except _ETAG_CACHE_ERRORS as e:
+            # Ohne Cache geht es weiter, nur ohne bedingten GET beim nächsten Mal
+            logger.warning(f"ETag-Cache konnte nicht geschrieben werden: {e}")
+    return ET.fromstring(response.content)
+
+def load_shape_cache():
+    """Lädt die gespeicherten Shape-Titel, ein leeres Dictionary wenn die Datei fehlt oder unlesbar ist."""
+    try:
+        with open(SHAPE_CACHE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_shape_cache(shape_cache):
+    """
+    Speichert die Shape-Titel für die nächsten Aufrufe - atomar über eine temporäre Datei, damit nie eine halb geschriebene Datei gelesen wird.
+    Kann nicht geschrieben werden, wird nur gewarnt: die Titel werden dann beim nächsten Aufruf erneut gelesen.
+    """
+    temp_file = f"{SHAPE_CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(SHAPE_CACHE_FILE), exist_ok=True)
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(shape_cache, f, indent=1)
+        os.replace(temp_file, SHAPE_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Shape-Cache konnte nicht gespeichert werden: {e}")
+
+def get_shape_uri(component, shapes, artifact_type, max_workers=SHAPE_WORKERS):
+    """
+    Liefert die Shape-URL für einen Artefakttyp oder None. Die Titel aller Shapes werden nur gelesen, wenn für die
+    Komponente noch keine gespeichert sind oder der Typ dort fehlt - sonst ist es ein Nachschlagen im Dictionary.
+    Threadsicher: gleichzeitige Aufrufe für dieselbe Komponente lesen die Shapes nur einmal.
+    """
+    global _shape_cache
+    key = f"{component.project_uri} {component.local_config}"
+    with _shape_cache_lock:
+        if _shape_cache is None:
+            _shape_cache = load_shape_cache()
+        key_lock = _shape_key_locks[key]
+    with key_lock:
+        with _shape_cache_lock:
+            shape_titles = _shape_cache.get(key, {})
+        if shape_titles.get(artifact_type) not in shapes:
+            def fetch_title(shape_u):
+                # Die XPath-Auswertung läuft im Worker, nur der Titel wird zurückgegeben
+                shape_x = get_rdf_xml_conditional(component, shape_u, intent="Hole Shape")
+                return xpath_first(_XP_SHAPE_TITLE, shape_x)
+            shape_titles = {}
+            # Alle Titel werden gebraucht, daher wird nicht beim ersten Treffer abgebrochen
+            if max_workers > 1:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    titles = list(executor.map(fetch_title, shapes))
+            else:
+                titles = [fetch_title(shape_u) for shape_u in shapes]
+            for shape_u, shape_title in zip(shapes, titles):
+                # Bei gleichnamigen Shapes gewinnt das erste
+                shape_titles.setdefault(shape_title, shape_u)
+            with _shape_cache_lock:
+                _shape_cache[key] = shape_titles
+                save_shape_cache(_shape_cache)
+    return shape_titles.get(artifact_type)
+
 def connect_to_elm(host, username, password, jts_context='jts', rm_context='rm4', caching=2):
     """
     Stellt eine Verbindung zum ELM-Server her und gibt das RM-Anwendungsobjekt zurück.
@@ -72,59 +244,51 @@ def connect_to_elm(host, username, password, jts_context='jts', rm_context='rm4'
     logger.info(f"Verbinde mit ELM-Server auf {host}...")
     elmserver.setupproxy(host)
     the_server = elmserver.JazzTeamServer(host, username, password, verifysslcerts=False, jtsappstring=f"jts:{jts_context}", appstring='rm4', cachingcontrol=caching)
+    configure_session(the_server._session)
     dn_app = the_server.find_app(f"rm:{rm_context}", ok_to_create=True)
     logger.info("Verbindung erfolgreich hergestellt.")
     return dn_app
 
-def create_artifact_in_folder(component, artifact_type, artifact_title, folder_path):
+def create_artifact_in_folder(component, artifact_type, artifact_title, folder_path, parallel=True):
     """
-    Erstellt ein neues Artefakt in einem angegebenen Ordner.
+    Erstellt ein neues Artefakt in einem angegebenen Ordner. Mit parallel=False laufen Ordner- und Shape-Suche
+    nacheinander im aufrufenden Thread - für den Batch-Betrieb, der bereits mehrere Artefakte parallel erstellt.
     """
     logger.info(f"Erstelle Artefakt vom Typ '{artifact_type}' mit Titel '{artifact_title}' im Ordner '{folder_path}'...")
-    the_folder = component.find_folder(folder_path)
+    if parallel:
+        # Ordnersuche und Factory-/Shape-Suche sind unabhängig voneinander und laufen parallel
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            folder_future = executor.submit(component.find_folder, folder_path)
+            factory_u, shapes = component.get_factory_uri("oslc_rm:Requirement", return_shapes=True)
+            logger.info(f"Factory-URL: {factory_u}")
+            the_shape_u = get_shape_uri(component, shapes, artifact_type)
+            the_folder = folder_future.result()
+    else:
+        the_folder = component.find_folder(folder_path)
+        factory_u, shapes = component.get_factory_uri("oslc_rm:Requirement", return_shapes=True)
+        logger.info(f"Factory-URL: {factory_u}")
+        the_shape_u = get_shape_uri(component, shapes, artifact_type, max_workers=1)
     if the_folder is None:
         raise FileNotFoundError(f"Ordner '{folder_path}' nicht gefunden!")
     logger.info(f"Ordner-URL gefunden: {the_folder.folderuri}")
-    factory_u, shapes = component.get_factory_uri("oslc_rm:Requirement", return_shapes=True)
-    logger.info(f"Factory-URL: {factory_u}")
-    the_shape_u = None
-    for shape_u in shapes:
-        shape_x = component.execute_get_rdf_xml(shape_u)
-        shape_title = rdfxml.xmlrdf_get_resource_text(shape_x, ".//oslc:ResourceShape/dcterms:title")
-        if shape_title == artifact_type:
-            the_shape_u = shape_u
-            logger.info(f"Passendes Shape '{shape_title}' gefunden: {the_shape_u}")
-            break
     if the_shape_u is None:
         raise LookupError(f"Shape für den Artefakttyp '{artifact_type}' nicht gefunden!")
-    xml_payload = f"""<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
-        xmlns:dc="http://purl.org/dc/terms/"
-        xmlns:jazz_rm="http://jazz.net/ns/rm#"
-        xmlns:oslc="http://open-services.net/ns/core#"
-        xmlns:nav="http://jazz.net/ns/rm/navigation#">
-      <rdf:Description rdf:about="">
-        <rdf:type rdf:resource="http://open-services.net/ns/rm#Requirement"/>
-        {'<rdf:type rdf:resource="https://hep.continental.com/ns/automotive/rm/ty/heading"/> <rdf:type rdf:resource="http://jazz.net/ns/rm#Text"/>' if artifact_type == "Heading" else ''}
-        <dc:description rdf:parseType="Literal">Erstellt durch Python-Skript</dc:description>
-        <jazz_rm:primaryText rdf:parseType="Literal">
-            <div xmlns="http://www.w3.org/1999/xhtml"><p><span>{artifact_title}</span></p></div>
-        </jazz_rm:primaryText>
-        <dc:title rdf:parseType="Literal">{artifact_title}</dc:title>
-        <oslc:instanceShape rdf:resource="{the_shape_u}"/>
-        <nav:parent rdf:resource="{the_folder.folderuri}"/>
-      </rdf:Description>
-    </rdf:RDF>
-    """
-    thexml_x = ET.fromstring(xml_payload)
-    response = component.execute_post_rdf_xml(factory_u, data=thexml_x, intent="Erstelle neues Artefakt")
+    logger.info(f"Passendes Shape '{artifact_type}' gefunden: {the_shape_u}")
+    thexml_x = build_artifact_xml(artifact_type, artifact_title, the_shape_u, the_folder.folderuri)
+    # Mit 'Prefer: return=representation' liefern viele Server das neue Artefakt direkt in der POST-Antwort mit
+    response = component.execute_post_rdf_xml(factory_u, data=thexml_x, headers={'Prefer': 'return=representation'}, intent="Erstelle neues Artefakt")
     if response.status_code != 201:
         raise ConnectionError(f"POST-Anfrage zum Erstellen des Artefakts fehlgeschlagen! Status: {response.status_code}")
     the_artifact_u = response.headers.get('Location')
-    the_artifact_x = component.execute_get_rdf_xml(the_artifact_u, intent="Hole ID des neuen Artefakts")
-    the_id = rdfxml.xml_find_element(the_artifact_x, ".//dcterms:identifier").text
+    the_id = identifier_from_post_response(response)
+    if not the_id:
+        # Server hat die Präferenz nicht berücksichtigt - ID wie bisher per GET holen
+        the_artifact_x = component.execute_get_rdf_xml(the_artifact_u, intent="Hole ID des neuen Artefakts")
+        the_id = xpath_first(_XP_IDENTIFIER, the_artifact_x)
     logger.info(f"Artefakt erfolgreich erstellt! ID: {the_id}, URL: {the_artifact_u}")
     return the_artifact_u, the_id
 
+@functools.lru_cache(maxsize=128)
 def get_module_uri_by_id(component, module_id):
     """
     Findet die URI eines Moduls anhand seiner öffentlichen ID.
@@ -136,34 +300,62 @@ def get_module_uri_by_id(component, module_id):
     Returns:
         str: Die eindeutige URI des Moduls.
     """
-    logger.info(f"Suche nach Modul mit der ID '{module_id}'...")
+    return get_module_uris_by_ids(component, [module_id])[module_id]
+
+def get_module_uris_by_ids(component, module_ids):
+    """
+    Findet die URIs mehrerer Module anhand ihrer öffentlichen IDs mit einer einzigen OSLC-Abfrage ('in'-Operator).
+
+    Args:
+        component (elmclient.apps.rm.Component): Das Komponentenobjekt.
+        module_ids (iterable of str): Die öffentlichen IDs der Module.
+
+    Returns:
+        dict: Modul-ID -> eindeutige URI des Moduls.
+    """
+    module_ids = list(dict.fromkeys(module_ids))
+    logger.info(f"Suche nach Modulen mit den IDs {module_ids}...")
     qcbase = component.get_query_capability_uri("oslc_rm:Requirement")
-    # Suche nach einem Artefakt vom Typ 'Module', das die angegebene ID hat
+    # Suche nach Artefakten vom Typ 'Module', die eine der angegebenen IDs haben
     modules = component.execute_oslc_query(
         qcbase,
         whereterms=[
-            ['dcterms:identifier', '=', f'"{module_id}"'], 
+            ['dcterms:identifier', 'in', [f'"{module_id}"' for module_id in module_ids]],
             ['rdf:type', '=', '<http://jazz.net/ns/rm#Module>']
         ],
-        select=['*'],
+        select=['dcterms:identifier'],
         prefixes={rdfxml.RDF_DEFAULT_PREFIX["dcterms"]: 'dcterms'}
     )
-    if len(modules) == 0:
-        raise FileNotFoundError(f"Kein Modul mit der ID '{module_id}' gefunden.")
-    if len(modules) > 1:
-        # Dies sollte theoretisch nie passieren, da IDs einzigartig sein sollten.
-        logger.warning(f"Mehr als ein Modul mit der ID '{module_id}' gefunden. Verwende das erste.")
-    
-    module_uri = list(modules.keys())[0]
-    logger.info(f"Modul gefunden: {module_uri}")
-    return module_uri
+    module_uris = {}
+    for module_uri, props in modules.items():
+        module_id = props.get('dcterms:identifier')
+        if module_id in module_uris:
+            # Dies sollte theoretisch nie passieren, da IDs einzigartig sein sollten.
+            logger.warning(f"Mehr als ein Modul mit der ID '{module_id}' gefunden. Verwende das erste.")
+            continue
+        module_uris[module_id] = module_uri
+        logger.info(f"Modul '{module_id}' gefunden: {module_uri}")
+    for module_id in module_ids:
+        if module_id not in module_uris:
+            raise FileNotFoundError(f"Kein Modul mit der ID '{module_id}' gefunden.")
+    return module_uris
 
 
+@functools.lru_cache(maxsize=256)
+def resolve_structure_uri(component, module_uri):
+    """Liefert die URL der Struktur eines Moduls - innerhalb eines Laufs wird sie je Modul nur einmal geholt."""
+    mod_x = get_rdf_xml_conditional(component, module_uri, intent="Hole Modul-Metadaten")
+    return xpath_first(_XP_STRUCTURE, mod_x)
+
+def invalidate_module_caches():
+    """Verwirft die gemerkten Modul- und Struktur-URIs, z.B. wenn ein PUT wegen eines veralteten ETags (412) scheitert."""
+    get_module_uri_by_id.cache_clear()
+    resolve_structure_uri.cache_clear()
+
 def bind_artifact_to_module_structure(component, module_uri, artifact_to_bind_uri):
     """Bindet ein vorhandenes Artefakt in die Struktur eines Moduls ein."""
     logger.info(f"Binde Artefakt {artifact_to_bind_uri} in Modul {module_uri} ein...")
-    mod_x = component.execute_get_rdf_xml(module_uri, cacheable=False, intent="Hole Modul-Metadaten")
-    structure_u = rdfxml.xmlrdf_get_resource_uri(mod_x, ".//rm_modules:structure")
+    structure_u = resolve_structure_uri(component, module_uri)
     logger.info(f"Struktur-URL: {structure_u}")
     modstructure_x, etag = component.execute_get_rdf_xml(
         structure_u, 
@@ -172,30 +364,31 @@ def bind_artifact_to_module_structure(component, module_uri, artifact_to_bind_ur
         intent="Hole Modulstruktur und ETag"
     )
     logger.info(f"ETag für die Struktur erhalten: {etag}")
-    first_child_bindings = rdfxml.xml_find_elements(modstructure_x, 'rm_modules:Binding/rm_modules:childBindings')[0]
-    new_binding_xml = ET.fromstring(
-        f"""<rm_modules:Binding
-                xmlns:rdf='{rdfxml.RDF_DEFAULT_PREFIX["rdf"]}'
-                xmlns:oslc_config='{rdfxml.RDF_DEFAULT_PREFIX["oslc_config"]}'
-                xmlns:rm_modules='{rdfxml.RDF_DEFAULT_PREFIX["rm_modules"]}'
-                rdf:about="">
-            <oslc_config:component rdf:resource="{component.project_uri}"/>
-            <rm_modules:boundArtifact rdf:resource="{artifact_to_bind_uri}"/>
-            <rm_modules:module rdf:resource="{module_uri}"/>
-            <rm_modules:childBindings rdf:resource="http://www.w3.org/1999/02/22-rdf-syntax-ns#nil"/>
-        </rm_modules:Binding>"""
-    )
-    first_child_bindings.append(new_binding_xml)
+    first_child_bindings = _XP_CHILD_BINDINGS(modstructure_x)[0]
+    # Binding direkt als Unterelement aufbauen - die Präfixe sind in der Struktur bereits deklariert, der XML-Parser wird nicht benötigt
+    rdf_resource = rdfxml.uri_to_tag('rdf:resource')
+    new_binding_xml = ET.SubElement(first_child_bindings, rdfxml.uri_to_tag('rm_modules:Binding'), {rdfxml.uri_to_tag('rdf:about'): ""})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('oslc_config:component'), {rdf_resource: component.project_uri})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('rm_modules:boundArtifact'), {rdf_resource: artifact_to_bind_uri})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('rm_modules:module'), {rdf_resource: module_uri})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('rm_modules:childBindings'), {rdf_resource: rdfxml.RDF_DEFAULT_PREFIX["rdf"] + "nil"})
     logger.info("XML-Struktur für das Binding vorbereitet.")
-    response = component.execute_post_rdf_xml(
-        structure_u, 
-        data=modstructure_x, 
-        put=True, 
-        cacheable=False, 
-        headers={'If-Match': etag}, 
-        intent="Aktualisiere Modulstruktur"
-    )
+    try:
+        response = component.execute_post_rdf_xml(
+            structure_u, 
+            data=modstructure_x, 
+            put=True, 
+            cacheable=False, 
+            headers={'If-Match': etag}, 
+            intent="Aktualisiere Modulstruktur"
+        )
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 412:
+            invalidate_module_caches()
+        raise
     logger.info(f"PUT-Antwort zum Aktualisieren der Struktur: {response.status_code}")
+    if response.status_code == 412:
+        invalidate_module_caches()
     if response.status_code not in [200, 201, 202]:
          raise ConnectionError(f"Update der Modulstruktur fehlgeschlagen! Status: {response.status_code}")
     location = response.headers.get('Location')
@@ -209,57 +402,162 @@ def bind_artifact_to_module_structure(component, module_uri, artifact_to_bind_ur
 # HAUPTPROGRAMM
 # =================================================================================================
 
-def main():
-    """Hauptfunktion des Skripts."""
-    parser = argparse.ArgumentParser(description='Erstellt ein DOORS NG Artefakt und bindet es in ein Modul ein.')
-    parser.add_argument('artifact_type', help='Typ des Artefakts (z.B. "Requirement" oder "Heading").')
-    parser.add_argument('artifact_title', help='Titel und primärer Text des Artefakts.')
-    parser.add_argument('folder_path', help='Pfad zum Ordner, in dem das Artefakt erstellt wird (z.B. "ConsumerRatings artifacts").')
+def parse_arguments(argv=None):
+    """
+    Wertet die Kommandozeile aus. Entweder wird ein einzelnes Artefakt angegeben, mit --batch eine CSV-Datei,
+    deren Zeilen jeweils Typ, Titel, Ordner und Modul-ID enthalten, oder mit --worker werden die Zeilen
+    als JSON (eine Zeile je Artefakt) von stdin gelesen.
+
+    Returns:
+        tuple: (args, rows) - rows ist eine Liste von (artifact_type, artifact_title, folder_path, module_id),
+        im Worker-Modus None.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if '--worker' in argv:
+        parser = argparse.ArgumentParser(description='Liest Artefakte als JSON-Zeilen von stdin, erstellt sie und bindet sie in Module ein.')
+        parser.add_argument('--worker', action='store_true', required=True,
+                            help='Jede Zeile auf stdin: {"type": ..., "title": ..., "folder": ..., "module_id": ...}; das Ergebnis wird als JSON-Zeile ausgegeben.')
+    elif '--batch' in argv:
+        parser = argparse.ArgumentParser(description='Erstellt mehrere DOORS NG Artefakte und bindet sie in Module ein.')
+        parser.add_argument('--batch', required=True, metavar='CSV', help='CSV-Datei, jede Zeile: Typ,Titel,Ordner,Modul-ID.')
+    else:
+        parser = argparse.ArgumentParser(description='Erstellt ein DOORS NG Artefakt und bindet es in ein Modul ein.')
+        parser.add_argument('artifact_type', help='Typ des Artefakts (z.B. "Requirement" oder "Heading").')
+        parser.add_argument('artifact_title', help='Titel und primärer Text des Artefakts.')
+        parser.add_argument('folder_path', help='Pfad zum Ordner, in dem das Artefakt erstellt wird (z.B. "ConsumerRatings artifacts").')
     parser.add_argument('project_name', help='Name des RM-Projekts.')
     parser.add_argument('component_name', help='Name der Komponente im Projekt.')
     parser.add_argument('config_name', help='Name der Konfiguration (Stream/Changeset).')
-    # *** ÄNDERUNG HIER: Erwartet jetzt die ID statt des Namens ***
-    parser.add_argument('module_id', help='Die öffentliche ID des Moduls (z.B. 12345), in das eingebunden wird.')
+    if '--batch' not in argv and '--worker' not in argv:
+        # *** ÄNDERUNG HIER: Erwartet jetzt die ID statt des Namens ***
+        parser.add_argument('module_id', help='Die öffentliche ID des Moduls (z.B. 12345), in das eingebunden wird.')
     parser.add_argument('username', help='Dein Benutzername.')
     parser.add_argument('password', help='Dein Passwort.')
-    
-    args = parser.parse_args()
-    setup_logging()
-    utils.log_commandline(os.path.basename(sys.argv[0]))
 
-    try:
-        jazzhost = 'https://tbd.de' # Bitte anpassen
-        dn_app = connect_to_elm(jazzhost, args.username, args.password)
-        project = dn_app.find_project(args.project_name)
-        component = project.find_local_component(args.component_name)
-        config_uri = component.get_local_config(args.config_name)
-        component.set_local_config(config_uri)
-        logger.info(f"Kontext gesetzt auf Projekt '{args.project_name}', Komponente '{args.component_name}', Konfiguration '{args.config_name}'.")
-
-        new_artifact_uri, new_artifact_id = create_artifact_in_folder(
-            component=component,
-            artifact_type=args.artifact_type,
-            artifact_title=args.artifact_title,
-            folder_path=args.folder_path
-        )
+    args = parser.parse_args(argv)
+    if '--worker' in argv:
+        rows = None
+    elif '--batch' in argv:
+        with open(args.batch, newline='', encoding='utf-8') as f:
+            rows = [tuple(row) for row in csv.reader(f) if row]
+        for row in rows:
+            if len(row) != 4:
+                parser.error(f"Ungültige Zeile in {args.batch}: {row} - erwartet werden Typ,Titel,Ordner,Modul-ID")
+    else:
+        rows = [(args.artifact_type, args.artifact_title, args.folder_path, args.module_id)]
+    return args, rows
 
-        # *** ÄNDERUNG HIER: Verwende die neue Funktion, um das Modul über die ID zu finden ***
-        module_uri = get_module_uri_by_id(component, args.module_id)
+def connect_component(args):
+    """Verbindet sich mit ELM und setzt Projekt, Komponente und Konfiguration - einmal je Lauf."""
+    jazzhost = 'https://tbd.de' # Bitte anpassen
+    dn_app = connect_to_elm(jazzhost, args.username, args.password)
+    project = dn_app.find_project(args.project_name)
+    component = project.find_local_component(args.component_name)
+    config_uri = component.get_local_config(args.config_name)
+    component.set_local_config(config_uri)
+    logger.info(f"Kontext gesetzt auf Projekt '{args.project_name}', Komponente '{args.component_name}', Konfiguration '{args.config_name}'.")
+    return dn_app, component
+
+def create_bind_one(component, row, module_uri=None, parallel=True):
+    """
+    Erstellt genau ein Artefakt und bindet es in sein Modul ein. Die Komponente ist bereits verbunden und konfiguriert.
 
-        qcbase = component.get_query_capability_uri("oslc_rm:Requirement")
-        artifacts_to_bind = component.execute_oslc_query(qcbase, whereterms=[['dcterms:identifier', '=', new_artifact_id]])
-        if not artifacts_to_bind:
-            raise FileNotFoundError(f"Das neu erstellte Artefakt mit ID {new_artifact_id} konnte nicht für das Binding gefunden werden.")
-        
-        artifact_to_bind_uri = list(artifacts_to_bind.keys())[0]
+    Args:
+        row (tuple): (artifact_type, artifact_title, folder_path, module_id)
+        module_uri (str): Bereits bekannte Modul-URL; sonst wird sie über die Modul-ID gesucht.
+        parallel (bool): Ordner- und Shape-Suche innerhalb der Erstellung parallelisieren (siehe create_artifact_in_folder).
 
+    Returns:
+        tuple: (new_artifact_uri, new_artifact_id, module_id)
+    """
+    artifact_type, artifact_title, folder_path, module_id = row
+    new_artifact_uri, new_artifact_id = create_artifact_in_folder(
+        component=component,
+        artifact_type=artifact_type,
+        artifact_title=artifact_title,
+        folder_path=folder_path,
+        parallel=parallel
+    )
+    module_uri = module_uri or get_module_uri_by_id(component, module_id)
+    with _module_bind_locks_lock:
+        bind_lock = _module_bind_locks[module_uri]
+    # Nur das Einbinden je Modul serialisieren - das Erstellen läuft voll parallel
+    with bind_lock:
+        # Die URL aus dem Location-Header der Erstellung ist bereits die Artefakt-URL - keine erneute Abfrage nötig
         bind_artifact_to_module_structure(
             component=component,
             module_uri=module_uri,
-            artifact_to_bind_uri=artifact_to_bind_uri
+            artifact_to_bind_uri=new_artifact_uri
         )
-        print("\nSkript erfolgreich abgeschlossen!")
-        print(f"Neues Artefakt '{new_artifact_id}' wurde erstellt und in das Modul mit der ID '{args.module_id}' eingebunden.")
+    return new_artifact_uri, new_artifact_id, module_id
+
+def main_batch(component, rows, max_workers=BATCH_WORKERS):
+    """
+    Erstellt und bindet alle Zeilen mit derselben Verbindung, parallel in einem Thread-Pool. Die Module werden vorab
+    mit einer einzigen Abfrage gefunden. Eine fehlgeschlagene Zeile bricht die anderen nicht ab.
+
+    Returns:
+        tuple: (created, failed) - die Ergebnisse von create_bind_one und die (row, exception) der fehlgeschlagenen
+        Zeilen, jeweils in der Reihenfolge der Zeilen
+    """
+    # *** ÄNDERUNG HIER: Alle Module werden mit einer einzigen Abfrage über ihre IDs gefunden ***
+    module_uris = get_module_uris_by_ids(component, [row[3] for row in rows])
+    # Mehrere Zeilen laufen bereits parallel - innerhalb einer Zeile dann keine weiteren Threads, so bleiben die gleichzeitigen
+    # Anfragen bei max_workers und innerhalb des Verbindungspools (configure_session). Eine einzelne Zeile (Einzelmodus)
+    # parallelisiert dagegen ihre Ordner- und Shape-Suche selbst.
+    parallel = len(rows) == 1
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(create_bind_one, component, row, module_uris[row[3]], parallel) for row in rows]
+        created, failed = [], []
+        for row, future in zip(rows, futures):
+            try:
+                created.append(future.result())
+            except Exception as e:
+                logger.error(f"Zeile {row} konnte nicht verarbeitet werden: {e}")
+                failed.append((row, e))
+        return created, failed
+
+def main_worker(component, infile=sys.stdin, outfile=sys.stdout):
+    """
+    Langlebiger Worker: liest je Zeile ein JSON-Objekt, erstellt und bindet das Artefakt und schreibt das Ergebnis
+    als JSON-Zeile. Fehler einzelner Zeilen beenden den Worker nicht.
+    """
+    for line in infile:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            row = (request['type'], request['title'], request['folder'], str(request['module_id']))
+            new_artifact_uri, new_artifact_id, module_id = create_bind_one(component, row)
+            result = {'ok': True, 'id': new_artifact_id, 'uri': new_artifact_uri, 'module_id': module_id}
+        except Exception as e:
+            logger.error(f"Zeile konnte nicht verarbeitet werden: {e}")
+            result = {'ok': False, 'error': str(e)}
+        outfile.write(json.dumps(result) + '\n')
+        outfile.flush()
+
+def main():
+    """Hauptfunktion des Skripts."""
+    args, rows = parse_arguments()
+    setup_logging()
+    utils.log_commandline(os.path.basename(sys.argv[0]))
+
+    dn_app = None
+    try:
+        dn_app, component = connect_component(args)
+
+        if rows is None:
+            main_worker(component)
+            return
+
+        created, failed = main_batch(component, rows)
+        print("\nSkript mit Fehlern abgeschlossen!" if failed else "\nSkript erfolgreich abgeschlossen!")
+        for new_artifact_uri, new_artifact_id, module_id in created:
+            print(f"Neues Artefakt '{new_artifact_id}' wurde erstellt und in das Modul mit der ID '{module_id}' eingebunden.")
+        for row, e in failed:
+            print(f"Zeile {row} fehlgeschlagen: {e}")
+        if failed:
+            sys.exit(1)
 
     except (FileNotFoundError, LookupError, ConnectionError, ValueError) as e:
         logger.error(f"Ein Fehler ist aufgetreten: {e}")
@@ -267,6 +565,10 @@ def main():
     except Exception as e:
         logger.error("Ein unerwarteter Fehler ist aufgetreten:", exc_info=True)
         sys.exit(1)
+    finally:
+        # Verbindungen des Pools schließen
+        if dn_app is not None:
+            dn_app.server._session.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
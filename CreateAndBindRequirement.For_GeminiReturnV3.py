@@ -25,30 +25,6 @@ import elmclient.rdfxml as rdfxml
 # Globale Variable für den Logger
 logger = logging.getLogger(__name__)
 
-# =================================================================================================
-# HILFSFUNKTIONEN
-# =================================================================================================
-def iterwalk(root, events=None, tags=None):
-    """Incrementally walks XML structure (like iterparse but for an existing ElementTree structure)"""
-    stack = [[root, list(root)]]
-    tags = [] if tags is None else tags if type(tags) == list else [tags]
-    events = events or ["start", "end"]
-    def iterator():
-        while stack:
-            elnow, children = stack[-1]
-            if children is None:
-                if (not tags or elnow.tag in tags) and "start" in events:
-                    yield ("start", elnow)
-                stack[-1][1] = list(elnow)
-            elif len(children) > 0:
-                thischild = children.pop(0)
-                stack.append([thischild, None])
-            else:
-                if len(stack) > 1 and (not tags or elnow.tag in tags) and "end" in events:
-                    yield ("end", elnow)
-                stack.pop()
-    return iterator
-    
 # =================================================================================================
 # MODULARE FUNKTIONEN
 # =================================================================================================
@@ -173,19 +149,13 @@ def bind_artifact_to_module_structure(component, module_uri, artifact_to_bind_ur
     # Greife sicher auf die erste gefundene Position zu
     first_child_bindings = child_bindings_list[0]
     
-    new_binding_xml = ET.fromstring(
-        f"""<rm_modules:Binding
-                xmlns:rdf='{rdfxml.RDF_DEFAULT_PREFIX["rdf"]}'
-                xmlns:oslc_config='{rdfxml.RDF_DEFAULT_PREFIX["oslc_config"]}'
-                xmlns:rm_modules='{rdfxml.RDF_DEFAULT_PREFIX["rm_modules"]}'
-                rdf:about="">
-            <oslc_config:component rdf:resource="{component.project_uri}"/>
-            <rm_modules:boundArtifact rdf:resource="{artifact_to_bind_uri}"/>
-            <rm_modules:module rdf:resource="{module_uri}"/>
-            <rm_modules:childBindings rdf:resource="http://www.w3.org/1999/02/22-rdf-syntax-ns#nil"/>
-        </rm_modules:Binding>"""
-    )
-    first_child_bindings.append(new_binding_xml)
+    # Binding direkt als Unterelement aufbauen - die Präfixe sind in der Struktur bereits deklariert, der XML-Parser wird nicht benötigt
+    rdf_resource = rdfxml.uri_to_tag('rdf:resource')
+    new_binding_xml = ET.SubElement(first_child_bindings, rdfxml.uri_to_tag('rm_modules:Binding'), {rdfxml.uri_to_tag('rdf:about'): ""})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('oslc_config:component'), {rdf_resource: component.project_uri})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('rm_modules:boundArtifact'), {rdf_resource: artifact_to_bind_uri})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('rm_modules:module'), {rdf_resource: module_uri})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('rm_modules:childBindings'), {rdf_resource: rdfxml.RDF_DEFAULT_PREFIX["rdf"] + "nil"})
     logger.info("XML-Struktur für das Binding vorbereitet.")
     response = component.execute_post_rdf_xml(
         structure_u, 
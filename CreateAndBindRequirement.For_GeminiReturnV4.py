@@ -10,19 +10,101 @@
 #
 # ********************************************************************************************************************************
 
+import concurrent.futures
+import json
 import logging
 import os.path
 import sys
 import argparse
+import csv
+import functools
+import threading
 import time
-import lxml.etree as ET
 
-import elmclient.server as elmserver
-import elmclient.utils as utils
-import elmclient.rdfxml as rdfxml
+# Schwere Abhängigkeiten (lxml, requests, elmclient) werden erst nach dem Auswerten der Kommandozeile geladen,
+# damit --help und fehlerhafte Aufrufe ohne deren Importzeit auskommen - siehe import_dependencies()
+ET = requests = Retry = elmserver = utils = rdfxml = None
 
 logger = logging.getLogger(__name__)
 
+def import_dependencies():
+    """Lädt lxml, requests und elmclient in die Modul-Globals und kompiliert die davon abhängigen XPath-Ausdrücke."""
+    global ET, requests, Retry, elmserver, utils, rdfxml, _XP_INSERTION_POINT
+    import lxml.etree as ET
+    import requests
+    from urllib3.util.retry import Retry
+
+    import elmclient.server as elmserver
+    import elmclient.utils as utils
+    import elmclient.rdfxml as rdfxml
+
+    _XP_INSERTION_POINT = ET.XPath(INSERTION_POINT_XPATH, namespaces=rdfxml.RDF_DEFAULT_PREFIX)
+
+# Zwischenspeicher für die Konfigurations-URL je (Server, Projekt, Komponente, Konfiguration) über mehrere Aufrufe hinweg.
+# Die Zuordnung ändert sich nur selten, die Einträge verfallen nach CONTEXT_CACHE_TTL Sekunden - zum Leeren Datei löschen oder --no-cache
+CONTEXT_CACHE_FILE = os.path.expanduser("~/.cache/gemini_exchange/context.json")
+CONTEXT_CACHE_TTL = 86400
+# Ordnerpfad -> Ordner-URL je Komponente in derselben Datei, kürzer gültig, da Ordner öfter umgebaut werden
+FOLDER_CACHE_TTL = 3600
+_context_cache_lock = threading.Lock()
+
+# Anzahl paralleler Erstellungen im Batch-Betrieb (nicht größer als der Verbindungspool, siehe configure_session)
+BATCH_WORKERS = 8
+
+# =================================================================================================
+# FEHLERKLASSEN
+# =================================================================================================
+
+class ElmError(Exception):
+    """Basisklasse für Fehler im Umgang mit ELM. Exit-Code 1, sofern keine Unterklasse zutrifft."""
+    exit_code = 1
+
+class ElmAuthError(ElmError):
+    """Anmeldung oder Berechtigung fehlgeschlagen (401/403) - dauerhaft, eine Wiederholung ist zwecklos."""
+    exit_code = 2
+
+class ElmLookupError(ElmError, LookupError):
+    """Projekt, Komponente, Konfiguration, Ordner, Shape, Modul oder Artefakt nicht gefunden (auch HTTP 404)."""
+    exit_code = 3
+
+class ElmTransientError(ElmError):
+    """Vorübergehender Fehler (5xx, Timeout, Verbindungsabbruch, wiederholte 412) - ein späterer Lauf kann gelingen."""
+    exit_code = 4
+
+# elmclient meldet eine fehlgeschlagene Anmeldung nicht mit einer eigenen Klasse, sondern als allgemeine Exception mit diesen Texten
+_ELM_AUTH_MESSAGES = (
+    "Login not possible",
+    "Authorization Failure",
+    "Authorize not possible",
+    "Jazz FORM authorize not possible",
+    "JSA AP authentication failed",
+    "Non-JSA authentication not supported",
+    "Kerberos/SPNEGO Authentication",
+)
+
+def translate_request_errors(func):
+    """
+    Übersetzt Fehler von requests in die ElmError-Klassen: 401/403 -> ElmAuthError, 404 -> ElmLookupError,
+    5xx/Timeout/Verbindungsfehler -> ElmTransientError. Die Wiederholungen von elmclient und (beim Verbindungsaufbau)
+    des Retry-Adapters der Session sind zu diesem Zeitpunkt bereits erfolgt. Andere Fehler werden unverändert weitergereicht.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status in (401, 403):
+                raise ElmAuthError(f"Zugriff verweigert ({status}): {e}") from e
+            if status == 404:
+                raise ElmLookupError(f"Ressource nicht gefunden (404): {e}") from e
+            if status is not None and status >= 500:
+                raise ElmTransientError(f"Serverfehler ({status}): {e}") from e
+            raise
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise ElmTransientError(f"Verbindung zum Server fehlgeschlagen: {e}") from e
+    return wrapper
+
 # =================================================================================================
 # MODULARE FUNKTIONEN
 # =================================================================================================
@@ -37,23 +119,168 @@ def setup_logging(loglevel="INFO,OFF"):
     utils.setup_logging(filelevel=levels[0], consolelevel=levels[1])
     logger.info("Logging initialisiert.")
 
+def configure_session(session, pool_connections=1, pool_maxsize=8):
+    """
+    Konfiguriert die requests-Session, über die elmclient alle Anfragen schickt: ein Keep-Alive-Pool, damit nur einmal
+    ein TLS-Handshake anfällt, und Wiederholung, wenn die Verbindung nicht aufgebaut werden konnte. Die vorhandenen
+    Adapter werden angepasst statt ersetzt, da sie bei aktivem Caching das Caching übernehmen.
+    """
+    for adapter in session.adapters.values():
+        adapter.init_poolmanager(pool_connections, pool_maxsize, block=False)
+        # Nur Verbindungsaufbau-Fehler - die Anfrage hat den Server dann nie erreicht, auch ein POST wird also nicht doppelt
+        # ausgeführt. Lese- und Statusfehler (z.B. 503) wiederholt ausschließlich elmclient selbst (_execute_request), sonst multiplizieren sich die Versuche
+        adapter.max_retries = Retry(total=3, connect=3, read=0, status=0, other=0, allowed_methods=Retry.DEFAULT_ALLOWED_METHODS, backoff_factor=0.3)
+    session.headers['Connection'] = 'keep-alive'
+
+@translate_request_errors
 def connect_to_elm(host, username, password, jts_context='jts', rm_context='rm4', caching=2):
     """Stellt eine Verbindung zum ELM-Server her und gibt das RM-Anwendungsobjekt zurück."""
     logger.info(f"Verbinde mit ELM-Server auf {host}...")
     elmserver.setupproxy(host)
-    server = elmserver.JazzTeamServer(host, username, password, verifysslcerts=False, jtsappstring=f"jts:{jts_context}", appstring='rm4', cachingcontrol=caching)
-    dn_app = server.find_app(f"rm:{rm_context}", ok_to_create=True)
+    try:
+        server = elmserver.JazzTeamServer(host, username, password, verifysslcerts=False, jtsappstring=f"jts:{jts_context}", appstring='rm4', cachingcontrol=caching)
+        # Alle weiteren Aufrufe (Projekt, Komponente, Konfiguration, Erstellen, Einbinden) laufen über diese eine Session
+        configure_session(server._session)
+        dn_app = server.find_app(f"rm:{rm_context}", ok_to_create=True)
+    except Exception as e:
+        # Nur echte Anmeldefehler werden zu ElmAuthError (Exit-Code 2) - alles andere (falscher Kontext, Discovery, Programmfehler) bleibt, wie es ist
+        if type(e) is Exception and str(e).startswith(_ELM_AUTH_MESSAGES):
+            raise ElmAuthError(f"Anmeldung an {host} nicht möglich: {e}") from e
+        raise
     logger.info("Verbindung erfolgreich hergestellt.")
     return dn_app
 
-def create_artifact_in_folder(component, artifact_type, artifact_title, folder_path):
-    """Erstellt ein neues Core-Artefakt in einem angegebenen Ordner."""
-    logger.info(f"Erstelle Artefakt '{artifact_title}' vom Typ '{artifact_type}' im Ordner '{folder_path}'...")
-    
+@translate_request_errors
+def open_component(dn_app, project_name, component_name):
+    """Öffnet Projekt und Komponente; beide lesen den Katalog vom Server, daher werden deren HTTP-Fehler übersetzt."""
+    project = dn_app.find_project(project_name)
+    if project is None:
+        raise ElmLookupError(f"Projekt '{project_name}' nicht gefunden!")
+    component = project.find_local_component(component_name)
+    if component is None:
+        raise ElmLookupError(f"Komponente '{component_name}' nicht gefunden!")
+    return component
+
+def _load_context_cache():
+    """Liest den Kontext-Zwischenspeicher, ein leeres Dict wenn die Datei fehlt, unlesbar oder kein Dict ist."""
+    try:
+        with open(CONTEXT_CACHE_FILE, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def _save_context_cache(cache):
+    """
+    Schreibt den Kontext-Zwischenspeicher atomar über eine temporäre Datei, damit ein anderer Prozess nie eine halb
+    geschriebene Datei liest; ein Fehler beim Schreiben ist nicht kritisch.
+    """
+    temp_file = f"{CONTEXT_CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(CONTEXT_CACHE_FILE), exist_ok=True)
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(temp_file, CONTEXT_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Kontext-Zwischenspeicher konnte nicht geschrieben werden: {e}")
+
+def _cached_uri(cache_key, ttl):
+    """Liefert die URL eines Eintrags im Kontext-Zwischenspeicher, None wenn er fehlt, abgelaufen oder ungültig ist."""
+    with _context_cache_lock:
+        entry = _load_context_cache().get(cache_key)
+    if not isinstance(entry, dict):
+        return None
+    uri, saved = entry.get('uri'), entry.get('time')
+    if not isinstance(uri, str) or not isinstance(saved, (int, float)) or time.time() - saved >= ttl:
+        return None
+    return uri
+
+def _store_cached_uri(cache_key, uri):
+    """Speichert eine URL im Kontext-Zwischenspeicher (Lesen und Schreiben unter dem Lock, damit kein Eintrag verloren geht)."""
+    with _context_cache_lock:
+        cache = _load_context_cache()
+        cache[cache_key] = {'uri': uri, 'time': time.time()}
+        _save_context_cache(cache)
+
+def _invalidate_context_cache(*cache_keys):
+    """Entfernt Einträge aus dem Kontext-Zwischenspeicher, damit der nächste Lauf sie live ermittelt."""
+    with _context_cache_lock:
+        cache = _load_context_cache()
+        removed = [cache_key for cache_key in cache_keys if cache.pop(cache_key, None) is not None]
+        if removed:
+            logger.info(f"{len(removed)} zwischengespeicherte URL(s) verworfen.")
+            _save_context_cache(cache)
+
+def _cached_find_config(component, cache_key, config_name, use_cache=True):
+    """
+    Liefert die URL der lokalen Konfiguration - aus dem Zwischenspeicher, solange der Eintrag nicht abgelaufen ist,
+    sonst über component.get_local_config() (lädt alle Konfigurationen der Komponente).
+
+    Returns:
+        tuple: (config_uri, from_cache)
+    """
+    if use_cache:
+        config_uri = _cached_uri(cache_key, CONTEXT_CACHE_TTL)
+        if config_uri is not None:
+            logger.info(f"Konfigurations-URL aus Zwischenspeicher: {config_uri}")
+            return config_uri, True
+    config_uri = component.get_local_config(config_name)
+    if config_uri is None:
+        raise ElmLookupError(f"Konfiguration '{config_name}' nicht gefunden!")
+    if use_cache:
+        _store_cached_uri(cache_key, config_uri)
+    return config_uri, False
+
+@translate_request_errors
+def set_cached_local_config(component, cache_key, config_name, use_cache=True):
+    """
+    Setzt die lokale Konfiguration der Komponente, im Normalfall ohne die Liste der Konfigurationen abzurufen.
+    set_local_config() mit einer URL lädt nur noch die Services der Konfiguration. Schlägt das mit einer
+    zwischengespeicherten URL fehl (z.B. Stream gelöscht), wird der Eintrag verworfen und einmal live nachgeschlagen.
+    """
+    config_uri, from_cache = _cached_find_config(component, cache_key, config_name, use_cache)
+    try:
+        component.set_local_config(config_uri)
+    except requests.HTTPError:
+        if not from_cache:
+            raise
+        logger.warning(f"Zwischengespeicherte Konfigurations-URL {config_uri} ist nicht mehr gültig, ermittle sie neu...")
+        _invalidate_context_cache(cache_key)
+        config_uri, _ = _cached_find_config(component, cache_key, config_name, use_cache)
+        component.set_local_config(config_uri)
+    return config_uri
+
+def _folder_cache_key(component, folder_path):
+    """Schlüssel für eine Ordner-URL im Kontext-Zwischenspeicher - je Konfiguration, da ein Ordner nicht in jedem Stream/Changeset existiert."""
+    return json.dumps(['folder', component.project_uri, component.local_config, folder_path])
+
+@translate_request_errors
+def resolve_folder_uri(component, folder_path, use_cache=True):
+    """
+    Liefert die URL des Ordners zu einem Pfad - aus dem Zwischenspeicher, solange der Eintrag nicht abgelaufen ist,
+    sonst über component.find_folder(), das den Ordnerbaum Ebene für Ebene abfragt.
+    """
+    cache_key = _folder_cache_key(component, folder_path)
+    if use_cache:
+        folder_uri = _cached_uri(cache_key, FOLDER_CACHE_TTL)
+        if folder_uri is not None:
+            logger.info(f"Ordner-URL aus Zwischenspeicher: {folder_uri}")
+            return folder_uri
     folder = component.find_folder(folder_path)
     if folder is None:
-        raise FileNotFoundError(f"Ordner '{folder_path}' nicht gefunden!")
+        raise ElmLookupError(f"Ordner '{folder_path}' nicht gefunden!")
     logger.info(f"Ordner-URL gefunden: {folder.folderuri}")
+    if use_cache:
+        _store_cached_uri(cache_key, folder.folderuri)
+    return folder.folderuri
+
+@translate_request_errors
+def create_artifact_in_folder(component, artifact_type, artifact_title, folder_path, folder_uri=None):
+    """Erstellt ein neues Core-Artefakt in einem angegebenen Ordner. Ist die Ordner-URL schon bekannt, entfällt die Ordnersuche."""
+    logger.info(f"Erstelle Artefakt '{artifact_title}' vom Typ '{artifact_type}' im Ordner '{folder_path}'...")
+    
+    if folder_uri is None:
+        folder_uri = resolve_folder_uri(component, folder_path)
 
     factory_uri, shapes = component.get_factory_uri("oslc_rm:Requirement", return_shapes=True)
     logger.info(f"Factory-URL: {factory_uri}")
@@ -67,7 +294,7 @@ def create_artifact_in_folder(component, artifact_type, artifact_title, folder_p
             logger.info(f"Passendes Shape '{shape_title}' gefunden: {shape_uri}")
             break
     if shape_uri is None:
-        raise LookupError(f"Shape für den Artefakttyp '{artifact_type}' nicht gefunden!")
+        raise ElmLookupError(f"Shape für den Artefakttyp '{artifact_type}' nicht gefunden!")
 
     xml_payload = f"""<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
         xmlns:dc="http://purl.org/dc/terms/" xmlns:jazz_rm="http://jazz.net/ns/rm#"
@@ -81,14 +308,14 @@ def create_artifact_in_folder(component, artifact_type, artifact_title, folder_p
         </jazz_rm:primaryText>
         <dc:title rdf:parseType="Literal">{artifact_title}</dc:title>
         <oslc:instanceShape rdf:resource="{shape_uri}"/>
-        <nav:parent rdf:resource="{folder.folderuri}"/>
+        <nav:parent rdf:resource="{folder_uri}"/>
       </rdf:Description>
     </rdf:RDF>"""
     
     response = component.execute_post_rdf_xml(factory_uri, data=ET.fromstring(xml_payload), intent="Erstelle Core-Artefakt")
     
     if response.status_code != 201:
-        raise ConnectionError(f"POST-Anfrage fehlgeschlagen! Status: {response.status_code}")
+        raise ElmError(f"POST-Anfrage fehlgeschlagen! Status: {response.status_code}")
     
     artifact_uri = response.headers.get('Location')
     artifact_xml = component.execute_get_rdf_xml(artifact_uri, intent="Hole ID des neuen Artefakts")
@@ -97,16 +324,21 @@ def create_artifact_in_folder(component, artifact_type, artifact_title, folder_p
     logger.info(f"Artefakt erfolgreich erstellt! ID: {artifact_id}, URL: {artifact_uri}")
     return artifact_uri, artifact_id
 
+@translate_request_errors
 def find_module_by_name(component, module_name):
-    """Findet ein Modul anhand seines Namens."""
+    """
+    Findet ein Modul anhand seines Namens. Der Server filtert nach Titel und Typ; es wird nur eine Seite mit
+    höchstens zwei Treffern geholt - genug, um Mehrdeutigkeit zu erkennen, ohne alle gleichnamigen Module zu laden.
+    """
     logger.info(f"Suche nach Modul '{module_name}'...")
     qc_base_uri = component.get_query_capability_uri("oslc_rm:Requirement")
     modules = component.execute_oslc_query(
         qc_base_uri,
         whereterms=[['dcterms:title', '=', f'"{module_name}"'], ['rdf:type', '=', '<http://jazz.net/ns/rm#Module>']],
+        maxresults=2,
     )
     if not modules:
-        raise FileNotFoundError(f"Kein Modul mit dem Namen '{module_name}' gefunden.")
+        raise ElmLookupError(f"Kein Modul mit dem Namen '{module_name}' gefunden.")
     if len(modules) > 1:
         logger.warning(f"Mehr als ein Modul mit dem Namen '{module_name}' gefunden. Verwende das erste.")
     
@@ -114,6 +346,7 @@ def find_module_by_name(component, module_name):
     logger.info(f"Modul gefunden: {module_uri}")
     return module_uri
 
+@translate_request_errors
 def find_artifact_uri_by_id(component, artifact_id):
     """Findet die URI eines Artefakts anhand seiner öffentlichen ID."""
     logger.info(f"Suche nach Artefakt-URI für die ID '{artifact_id}'...")
@@ -121,10 +354,11 @@ def find_artifact_uri_by_id(component, artifact_id):
     artifacts = component.execute_oslc_query(
         qc_base_uri,
         whereterms=[['dcterms:identifier', '=', f'"{artifact_id}"']],
-        select=['*']
+        select=['*'],
+        maxresults=1,
     )
     if not artifacts:
-        raise FileNotFoundError(f"Kein Artefakt mit der ID '{artifact_id}' in dieser Konfiguration gefunden.")
+        raise ElmLookupError(f"Kein Artefakt mit der ID '{artifact_id}' in dieser Konfiguration gefunden.")
     
     # Es kann mehrere Treffer geben (z.B. in verschiedenen Modulen), aber wir brauchen nur die URI des Core-Artefakts.
     # Wir nehmen an, der erste Treffer ist der richtige.
@@ -132,10 +366,18 @@ def find_artifact_uri_by_id(component, artifact_id):
     logger.info(f"Artefakt-URI gefunden: {artifact_uri}")
     return artifact_uri
 
-def bind_artifact_to_module(component, module_uri, artifact_to_bind_uri):
-    """Bindet ein Artefakt in die Struktur eines Moduls ein."""
-    logger.info(f"Binde Artefakt {artifact_to_bind_uri} in Modul {module_uri} ein...")
+# Einfügeposition in der Modulstruktur, einmal in import_dependencies() kompiliert
+# ACHTUNG: Harte Annahme über die Einfügeposition. Dies ist eine potenzielle Schwachstelle für leere Module.
+INSERTION_POINT_XPATH = 'rm_modules:Binding/rm_modules:childBindings/rm_modules:Binding/rm_modules:childBindings'
+_XP_INSERTION_POINT = None
 
+def open_module_structure(component, module_uri):
+    """
+    Holt die Struktur eines Moduls samt ETag und sucht die Einfügeposition - einmal je Stapel von Bindings.
+
+    Returns:
+        tuple: (structure_uri, etag, structure_xml, insertion_point)
+    """
     mod_xml = component.execute_get_rdf_xml(module_uri, cacheable=False, intent="Hole Modul-Metadaten")
     structure_uri = rdfxml.xmlrdf_get_resource_uri(mod_xml, ".//rm_modules:structure")
     logger.info(f"Struktur-URL: {structure_uri}")
@@ -143,105 +385,267 @@ def bind_artifact_to_module(component, module_uri, artifact_to_bind_uri):
     structure_xml, etag = component.execute_get_rdf_xml(structure_uri, cacheable=False, return_etag=True, intent="Hole Modulstruktur und ETag")
     logger.info(f"ETag für die Struktur erhalten: {etag}")
 
-    # ACHTUNG: Harte Annahme über die Einfügeposition. Dies ist eine potenzielle Schwachstelle für leere Module.
-    insertion_point_xpath = 'rm_modules:Binding/rm_modules:childBindings/rm_modules:Binding/rm_modules:childBindings'
-    insertion_point = rdfxml.xml_find_elements(structure_xml, insertion_point_xpath)
-    
+    insertion_point = _XP_INSERTION_POINT(structure_xml)
     if not insertion_point:
-         raise ValueError(f"Konnte keine gültige Einfügeposition mit XPath '{insertion_point_xpath}' finden. Ist das Modul leer oder hat es eine andere Struktur?")
-
-    new_binding_xml = ET.fromstring(
-        f"""<rm_modules:Binding
-                xmlns:rdf='{rdfxml.RDF_DEFAULT_PREFIX["rdf"]}'
-                xmlns:oslc_config='{rdfxml.RDF_DEFAULT_PREFIX["oslc_config"]}'
-                xmlns:rm_modules='{rdfxml.RDF_DEFAULT_PREFIX["rm_modules"]}'
-                rdf:about="">
-            <oslc_config:component rdf:resource="{component.project_uri}"/>
-            <rm_modules:boundArtifact rdf:resource="{artifact_to_bind_uri}"/>
-            <rm_modules:module rdf:resource="{module_uri}"/>
-            <rm_modules:childBindings rdf:resource="http://www.w3.org/1999/02/22-rdf-syntax-ns#nil"/>
-        </rm_modules:Binding>"""
-    )
-    insertion_point[0].append(new_binding_xml)
+         raise ValueError(f"Konnte keine gültige Einfügeposition mit XPath '{INSERTION_POINT_XPATH}' finden. Ist das Modul leer oder hat es eine andere Struktur?")
+    return structure_uri, etag, structure_xml, insertion_point[0]
 
-    response = component.execute_put_rdf_xml(
-        structure_uri, 
-        data=structure_xml, 
-        headers={'If-Match': etag}, 
-        intent="Aktualisiere Modulstruktur"
-    )
+def append_binding(insertion_point, component, module_uri, artifact_to_bind_uri):
+    """Hängt ein Binding für ein Artefakt an die Einfügeposition an (nur lokal im Baum)."""
+    # Binding direkt als Unterelement aufbauen - die Präfixe sind in der Struktur bereits deklariert, der XML-Parser wird nicht benötigt
+    rdf_resource = rdfxml.uri_to_tag('rdf:resource')
+    new_binding_xml = ET.SubElement(insertion_point, rdfxml.uri_to_tag('rm_modules:Binding'), {rdfxml.uri_to_tag('rdf:about'): ""})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('oslc_config:component'), {rdf_resource: component.project_uri})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('rm_modules:boundArtifact'), {rdf_resource: artifact_to_bind_uri})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('rm_modules:module'), {rdf_resource: module_uri})
+    ET.SubElement(new_binding_xml, rdfxml.uri_to_tag('rm_modules:childBindings'), {rdf_resource: rdfxml.RDF_DEFAULT_PREFIX["rdf"] + "nil"})
+
+def flush_module_structure(component, structure_uri, etag, structure_xml):
+    """
+    Schreibt die geänderte Struktur per PUT zurück und wartet ggf. auf den asynchronen Job.
+
+    Returns:
+        bool: False bei einem ETag-Konflikt (412), d.h. die Struktur wurde zwischenzeitlich geändert.
+    """
+    try:
+        response = component.execute_put_rdf_xml(
+            structure_uri, 
+            data=structure_xml, 
+            headers={'If-Match': etag}, 
+            intent="Aktualisiere Modulstruktur"
+        )
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 412:
+            return False
+        raise
 
     logger.info(f"PUT-Antwort zum Aktualisieren der Struktur: {response.status_code}")
+    if response.status_code == 412:
+        return False
     if response.status_code not in [200, 201, 202]:
-         raise ConnectionError(f"Update der Modulstruktur fehlgeschlagen! Status: {response.status_code}")
+         raise ElmError(f"Update der Modulstruktur fehlgeschlagen! Status: {response.status_code}")
     
     location = response.headers.get('Location')
     if response.status_code == 202 and location:
         logger.info("Warte auf Abschluss des asynchronen Update-Jobs...")
         component.wait_for_tracker(location, interval=1.0, progressbar=True, msg="Struktur-Update")
-    
-    logger.info("Artefakt erfolgreich in Modulstruktur eingebunden.")
+    return True
+
+@translate_request_errors
+def bind_artifacts_to_module(component, module_uri, artifact_uris, attempts=3):
+    """
+    Bindet mehrere Artefakte mit einem Abruf und einem PUT der Modulstruktur ein. Bei einem ETag-Konflikt (412)
+    wird der ganze Stapel mit frisch geholter Struktur wiederholt.
+    """
+    logger.info(f"Binde {len(artifact_uris)} Artefakt(e) in Modul {module_uri} ein...")
+    for attempt in range(1, attempts + 1):
+        structure_uri, etag, structure_xml, insertion_point = open_module_structure(component, module_uri)
+        for artifact_uri in artifact_uris:
+            append_binding(insertion_point, component, module_uri, artifact_uri)
+        if flush_module_structure(component, structure_uri, etag, structure_xml):
+            logger.info("Artefakt(e) erfolgreich in Modulstruktur eingebunden.")
+            return
+        logger.warning(f"Modulstruktur wurde zwischenzeitlich geändert (412) - Versuch {attempt}/{attempts}, hole Struktur neu...")
+    raise ElmTransientError("Update der Modulstruktur fehlgeschlagen! Die Struktur wurde wiederholt gleichzeitig geändert (412).")
+
+def bind_artifact_to_module(component, module_uri, artifact_to_bind_uri):
+    """Bindet ein Artefakt in die Struktur eines Moduls ein."""
+    bind_artifacts_to_module(component, module_uri, [artifact_to_bind_uri])
 
 
 # =================================================================================================
 # HAUPTPROGRAMM
 # =================================================================================================
 
-def main():
-    """Hauptfunktion des Skripts."""
-    parser = argparse.ArgumentParser(description='Erstellt ein DOORS NG Artefakt und bindet es in ein Modul ein.')
-    parser.add_argument('artifact_type', help='Typ des Artefakts (z.B. "Anforderung").')
-    parser.add_argument('artifact_title', help='Titel und primärer Text des Artefakts.')
-    parser.add_argument('folder_path', help='Pfad zum Ordner, in dem das Artefakt erstellt wird.')
+def read_batch_rows(path):
+    """
+    Liest die Artefakte für den Batch-Betrieb: CSV-Datei oder, bei Endung .jsonl, eine JSON-Zeile je Artefakt.
+    Spalten bzw. Schlüssel: artifact_type, artifact_title, folder_path.
+
+    Returns:
+        list: Liste von (artifact_type, artifact_title, folder_path).
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.jsonl'):
+            rows = []
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    rows.append((entry['artifact_type'], entry['artifact_title'], entry['folder_path']))
+            return rows
+        rows = [tuple(row) for row in csv.reader(f) if row]
+    for row in rows:
+        if len(row) != 3:
+            raise ValueError(f"Ungültige Zeile in {path}: {row} - erwartet werden artifact_type,artifact_title,folder_path")
+    return rows
+
+def parse_arguments(argv=None):
+    """
+    Wertet die Kommandozeile aus. Entweder wird ein einzelnes Artefakt angegeben oder mit --batch eine CSV-/JSONL-Datei
+    mit vielen Artefakten, die alle in dasselbe Modul eingebunden werden.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    batch = any(arg == '--batch' or arg.startswith('--batch=') for arg in argv)
+    parser = argparse.ArgumentParser(description='Erstellt DOORS NG Artefakte und bindet sie in ein Modul ein.')
+    if batch:
+        parser.add_argument('--batch', required=True, metavar='PATH', help='CSV- oder JSONL-Datei, je Zeile: artifact_type,artifact_title,folder_path.')
+    else:
+        parser.add_argument('artifact_type', help='Typ des Artefakts (z.B. "Anforderung").')
+        parser.add_argument('artifact_title', help='Titel und primärer Text des Artefakts.')
+        parser.add_argument('folder_path', help='Pfad zum Ordner, in dem das Artefakt erstellt wird.')
     parser.add_argument('project_name', help='Name des RM-Projekts.')
     parser.add_argument('component_name', help='Name der Komponente im Projekt.')
     parser.add_argument('config_name', help='Name der Konfiguration (Stream/Changeset).')
     parser.add_argument('module_name', help='Name des Moduls, in das das Artefakt eingebunden wird.')
     parser.add_argument('username', help='Dein Benutzername.')
     parser.add_argument('password', help='Dein Passwort.')
-    
-    args = parser.parse_args()
+    parser.add_argument('--no-cache', action='store_true', help='Konfigurations- und Ordner-URLs nicht aus dem Zwischenspeicher lesen, immer live ermitteln.')
+    parser.add_argument('--output', choices=['text', 'json'], default='text',
+                        help='Ausgabeformat auf stdout: Text oder je Artefakt eine JSON-Zeile mit artifact_id, artifact_uri und module_uri.')
+
+    args = parser.parse_args(argv)
+    if batch:
+        try:
+            rows = read_batch_rows(args.batch)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"Batch-Datei {args.batch} kann nicht gelesen werden: {e}")
+    else:
+        rows = [(args.artifact_type, args.artifact_title, args.folder_path)]
+    return args, rows
+
+def format_results(created, module_name, module_uri, output='text', failed=()):
+    """
+    Baut die Ausgabe für stdout: Text für Menschen oder je Zeile eine JSON-Zeile für die Weiterverarbeitung (z.B. mit jq).
+    Jede JSON-Zeile hat dieselben Schlüssel - "ok" wie beim Worker von ReturnV2, nicht zutreffende Werte sind null.
+    Für JSON wird orjson verwendet, falls installiert.
+
+    Args:
+        created (list): (row, artifact_uri, artifact_id) der erstellten Artefakte.
+        module_uri (str): URL des Moduls, in das sie eingebunden wurden - None, wenn das Einbinden nicht erfolgt ist.
+        failed (list): (row, exception) der Zeilen, deren Artefakt nicht erstellt werden konnte.
+    """
+    if output == 'json':
+        try:
+            import orjson
+            dumps = lambda obj: orjson.dumps(obj).decode('utf-8')
+        except ImportError:
+            dumps = json.dumps
+        unbound = None if module_uri is not None else f"Nicht in das Modul '{module_name}' eingebunden"
+        results = [(row, new_artifact_id, new_artifact_uri, unbound) for row, new_artifact_uri, new_artifact_id in created]
+        results.extend((row, None, None, str(e)) for row, e in failed)
+        return "".join(
+            dumps({"ok": error is None, "artifact_title": row[1], "artifact_id": new_artifact_id, "artifact_uri": new_artifact_uri,
+                   "module_uri": module_uri if new_artifact_uri is not None else None, "error": error}) + "\n"
+            for row, new_artifact_id, new_artifact_uri, error in results
+        )
+    if module_uri is not None and not failed:
+        msgs = ["\nSkript erfolgreich abgeschlossen!\n"]
+    else:
+        msgs = ["\nSkript mit Fehlern abgeschlossen!\n"]
+    if module_uri is not None:
+        msgs.extend(f"Neues Artefakt '{new_artifact_id}' wurde erstellt und in das Modul '{module_name}' eingebunden.\n" for _, new_artifact_uri, new_artifact_id in created)
+    else:
+        msgs.extend(f"Neues Artefakt '{new_artifact_id}' wurde erstellt, aber NICHT in das Modul '{module_name}' eingebunden: {new_artifact_uri}\n" for _, new_artifact_uri, new_artifact_id in created)
+    msgs.extend(f"Artefakt '{row[1]}' wurde NICHT erstellt: {e}\n" for row, e in failed)
+    return "".join(msgs)
+
+def main():
+    """Hauptfunktion des Skripts."""
+    args, rows = parse_arguments()
+    import_dependencies()
 
     setup_logging()
     utils.log_commandline(os.path.basename(sys.argv[0]))
 
+    dn_app = None
+    jazzhost = 'https://jazz.conti.de' # Später als Parameter oder aus Config-Datei
+    cache_key = json.dumps([jazzhost, args.project_name, args.component_name, args.config_name])
+    # alle in diesem Lauf verwendeten Einträge des Zwischenspeichers - bei einem Fehler werden sie verworfen
+    cache_keys = [cache_key]
     try:
-        jazzhost = 'https://jazz.conti.de' # Später als Parameter oder aus Config-Datei
         dn_app = connect_to_elm(jazzhost, args.username, args.password)
 
-        project = dn_app.find_project(args.project_name)
-        component = project.find_local_component(args.component_name)
-        config_uri = component.get_local_config(args.config_name)
-        component.set_local_config(config_uri)
+        component = open_component(dn_app, args.project_name, args.component_name)
+        set_cached_local_config(component, cache_key, args.config_name, use_cache=not args.no_cache)
         logger.info(f"Kontext gesetzt: Projekt '{args.project_name}', Komponente '{args.component_name}', Konfiguration '{args.config_name}'.")
 
-        # SCHRITT 1: Core-Artefakt erstellen
-        new_artifact_uri, new_artifact_id = create_artifact_in_folder(
-            component=component,
-            artifact_type=args.artifact_type,
-            artifact_title=args.artifact_title,
-            folder_path=args.folder_path
-        )
+        # Ordner-URLs einmal je unterschiedlichem Pfad auflösen - im Batch teilen sich meist viele Artefakte einen Ordner
+        folder_paths = list(dict.fromkeys(folder_path for _, _, folder_path in rows))
+        cache_keys.extend(_folder_cache_key(component, folder_path) for folder_path in folder_paths)
+        folder_uris = {folder_path: resolve_folder_uri(component, folder_path, use_cache=not args.no_cache) for folder_path in folder_paths}
 
-        # SCHRITT 2: Artefakt in Modul einbinden
-        module_uri = find_module_by_name(component, args.module_name)
-        
-        # Die URI des gerade erstellten Artefakts kann direkt verwendet werden
-        bind_artifact_to_module(
-            component=component,
-            module_uri=module_uri,
-            artifact_to_bind_uri=new_artifact_uri
-        )
-        
-        print("\nSkript erfolgreich abgeschlossen!")
-        print(f"Neues Artefakt '{new_artifact_id}' wurde erstellt und in das Modul '{args.module_name}' eingebunden.")
+        # SCHRITT 1: Core-Artefakte erstellen - parallel dazu das Modul suchen, das hängt nicht von den neuen Artefakten ab
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(BATCH_WORKERS, len(rows) + 1)) as executor:
+            module_future = executor.submit(find_module_by_name, component, args.module_name)
+            artifact_futures = [
+                executor.submit(
+                    create_artifact_in_folder,
+                    component=component,
+                    artifact_type=artifact_type,
+                    artifact_title=artifact_title,
+                    folder_path=folder_path,
+                    folder_uri=folder_uris[folder_path]
+                )
+                for artifact_type, artifact_title, folder_path in rows
+            ]
+            # Ergebnisse je Zeile sammeln - ein Fehler in einer Zeile darf die bereits erstellten Artefakte nicht verwaisen lassen
+            created = []
+            failed = []
+            for row, future in zip(rows, artifact_futures):
+                try:
+                    created.append((row, *future.result()))
+                except Exception as e:
+                    logger.error(f"Artefakt '{row[1]}' konnte nicht erstellt werden: {e}")
+                    failed.append((row, e))
 
-    except (FileNotFoundError, LookupError, ConnectionError, ValueError) as e:
+        # SCHRITT 2: Artefakte in Modul einbinden - alle mit einem Abruf und einem PUT der Modulstruktur
+        # Die URIs der gerade erstellten Artefakte können direkt verwendet werden
+        bound_module_uri = None
+        try:
+            # result() wirft einen Fehler der Modulsuche erneut, er landet so in der Fehlerbehandlung unten
+            module_uri = module_future.result()
+            if created:
+                bind_artifacts_to_module(
+                    component=component,
+                    module_uri=module_uri,
+                    artifact_uris=[new_artifact_uri for _, new_artifact_uri, _ in created]
+                )
+            bound_module_uri = module_uri
+        finally:
+            # Auch wenn die Modulsuche oder das Einbinden fehlschlägt, werden die erstellten Artefakte mit ihren URIs gemeldet
+            # Ausgabe gesammelt mit einem einzigen write() - das Logging geht auf stderr, stdout bleibt maschinenlesbar
+            if created or failed:
+                sys.stdout.write(format_results(created, args.module_name, bound_module_uri, args.output, failed))
+                sys.stdout.flush()
+
+        if failed:
+            # der Fehler der ersten fehlgeschlagenen Zeile bestimmt den Exit-Code
+            raise failed[0][1]
+
+    except ElmAuthError as e:
+        # Dauerhafter Fehler - keine Wiederholung
+        logger.error(f"Anmeldung/Berechtigung fehlgeschlagen: {e}")
+        sys.exit(e.exit_code)
+    except (ElmLookupError, ElmTransientError) as e:
+        # Kann auf eine veraltete Konfigurations- oder Ordner-URL zurückgehen - beim nächsten Lauf live ermitteln
+        _invalidate_context_cache(*cache_keys)
+        logger.error(f"Ein Fehler ist aufgetreten: {e}", exc_info=e.__cause__ is not None)
+        sys.exit(e.exit_code)
+    except (ElmError, ValueError) as e:
         logger.error(f"Ein Fehler ist aufgetreten: {e}")
         sys.exit(1)
-    except Exception as e:
+    except requests.HTTPError:
+        # Nicht zugeordneter HTTP-Fehler (z.B. 400/409) - Konfigurations- und Ordner-URLs beim nächsten Lauf live ermitteln
+        _invalidate_context_cache(*cache_keys)
+        logger.error("Ein HTTP-Fehler ist aufgetreten:", exc_info=True)
+        sys.exit(1)
+    except Exception:
         logger.error("Ein unerwarteter Fehler ist aufgetreten:", exc_info=True)
         sys.exit(1)
+    finally:
+        # Verbindungen des Pools schließen
+        if dn_app is not None:
+            dn_app.server._session.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file